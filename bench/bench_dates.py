@@ -0,0 +1,98 @@
+"""
+Micro-benchmark : test d'éligibilité sur des pages GF réalistes (25 torrents).
+
+Compare l'ancien chemin (dateutil + datetime.now() par torrent) au chemin
+actuel (datetime.fromisoformat une seule fois à l'ingestion dans un
+TorrentRecord, un seul cutoff par page).
+
+Usage : python bench/bench_dates.py [--pages 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser as date_parser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import main  # noqa: E402
+
+
+def make_page(start: datetime, per_page: int = 25) -> list[dict]:
+    """A GF-like page: newest first, one upload every ~8 minutes."""
+    return [
+        {
+            "id": str(100000 + i),
+            "attributes": {
+                "name": f"Some.Show.S01E{i:02d}.1080p.WEB.H264-GRP",
+                "created_at": (start - timedelta(minutes=8 * i)).strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+                "size": 1_500_000_000,
+                "seeders": 12,
+                "leechers": 1,
+                "category_id": 2,
+            },
+        }
+        for i in range(per_page)
+    ]
+
+
+def legacy_is_eligible(torrent: dict, min_age_hours: int = main.MIN_AGE_HOURS) -> bool:
+    """Eligibility check as it was before the fast path (dateutil per torrent)."""
+    created_at_str = torrent.get("attributes", {}).get("created_at")
+    if not created_at_str:
+        return False
+    created_at = date_parser.parse(created_at_str)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    age_hours = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
+    return age_hours >= min_age_hours
+
+
+def fresh_pages(pages: int) -> list[list[dict]]:
+    now = datetime.now(timezone.utc)
+    return [make_page(now - timedelta(hours=p)) for p in range(pages)]
+
+
+def bench(label: str, pages: list[list[dict]], check) -> float:
+    start = time.perf_counter()
+    eligible = 0
+    for page in pages:
+        eligible += check(page)
+    elapsed = time.perf_counter() - start
+    per_page_us = elapsed / len(pages) * 1e6
+    print(f"{label:<38} {per_page_us:9.1f} µs/page  ({eligible} eligible)")
+    return per_page_us
+
+
+def main_bench() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy = bench(
+        "legacy (dateutil, now() per torrent)",
+        fresh_pages(args.pages),
+        lambda page: sum(1 for t in page if legacy_is_eligible(t)),
+    )
+    cold = bench(
+        "fast path, ingest + filter",
+        fresh_pages(args.pages),
+        lambda page: len(main.filter_eligible(
+            [main.record_from_api(t) for t in page], main.eligibility_cutoff()
+        )),
+    )
+    pages = [[main.record_from_api(t) for t in page] for page in fresh_pages(args.pages)]
+    warm = bench(
+        "fast path, filter only (ingested)",
+        pages,
+        lambda page: len(main.filter_eligible(page, main.eligibility_cutoff())),
+    )
+
+    print(f"\nspeedup: x{legacy / cold:.1f} (with ingest), x{legacy / warm:.1f} (filter only)")
+
+
+if __name__ == "__main__":
+    main_bench()
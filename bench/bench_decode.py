@@ -0,0 +1,76 @@
+"""
+Micro-benchmark : décodage des pages /api/torrents/filter en TorrentRecord.
+
+Compare json.loads + record_from_api (dicts génériques), orjson + record_from_api
+et decode_gf_page (Structs msgspec : seuls les champs utilisés sont décodés),
+sur des pages au format GF générées par bench/fake_gf.py.
+
+Usage : python bench/bench_decode.py [--pages 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+import fake_gf  # noqa: E402
+import main  # noqa: E402
+
+
+def make_pages(pages: int, per_page: int = 25) -> list[bytes]:
+    fake_gf.settings.items = per_page * min(pages, 200)
+    catalog = fake_gf.build_catalog()
+    bodies = [
+        json.dumps({"data": catalog[i:i + per_page]}).encode()
+        for i in range(0, len(catalog), per_page)
+    ]
+    return [bodies[p % len(bodies)] for p in range(pages)]
+
+
+def bench(label: str, pages: list[bytes], decode) -> float:
+    start = time.perf_counter()
+    records = 0
+    for body in pages:
+        records += len(decode(body))
+    elapsed = time.perf_counter() - start
+    per_page_us = elapsed / len(pages) * 1e6
+    print(f"{label:<34} {per_page_us:9.1f} µs/page  ({records} records)")
+    return per_page_us
+
+
+def main_bench() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages)
+    print(f"page size: {sum(map(len, pages)) / len(pages) / 1024:.1f} KiB\n")
+
+    baseline = bench(
+        "json + record_from_api",
+        pages,
+        lambda body: [main.record_from_api(t) for t in json.loads(body)["data"]],
+    )
+    if main.orjson is not None:
+        bench(
+            "orjson + record_from_api",
+            pages,
+            lambda body: [main.record_from_api(t) for t in main.orjson.loads(body)["data"]],
+        )
+    if main.msgspec is None:
+        print("\nmsgspec not installed: decode_gf_page uses the orjson/json fallback")
+    fast = bench("decode_gf_page", pages, main.decode_gf_page)
+
+    # Same records either way
+    body = pages[0]
+    assert main.decode_gf_page(body) == [main.record_from_api(t) for t in json.loads(body)["data"]]
+    print(f"\nspeedup: x{baseline / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,225 @@
+"""
+Benchmark de charge hors ligne : proxy réel (uvicorn) contre le faux GF.
+
+Lance bench/fake_gf.py et le proxy dans des sous-processus, rejoue un mélange
+de requêtes réaliste (polls RSS Prowlarr, recherches Sonarr/Radarr, recherches
+manuelles, téléchargements) et affiche débit, latences p50/p99 par type et
+nombre de requêtes envoyées au faux GF.
+
+Usage :
+    python bench/bench_load.py --mix sonarr --requests 500 --concurrency 8
+    python bench/bench_load.py --latency 0.2 --rate-limit 30 --env SEARCH_FANOUT=4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, BENCH_DIR)
+
+from fake_gf import SHOWS  # noqa: E402
+
+# Types de requêtes : (nom, fabrique de paramètres /api)
+def rss(rng: random.Random) -> dict:
+    return {"t": "search", "cat": rng.choice(["2000,5000", "5000", "2000"])}
+
+
+def tvsearch(rng: random.Random) -> dict:
+    show = rng.randrange(len(SHOWS))
+    params = {"t": "tvsearch", "cat": "5000", "imdbid": f"tt{1000000 + show}", "season": rng.randint(1, 6)}
+    if rng.random() < 0.7:
+        params["ep"] = rng.randint(1, 12)
+    return params
+
+
+def movie(rng: random.Random) -> dict:
+    return {"t": "movie", "cat": "2000", "imdbid": f"tt{1000000 + rng.randrange(len(SHOWS))}"}
+
+
+def interactive(rng: random.Random) -> dict:
+    words = rng.choice(SHOWS).split(".")
+    return {"t": "search", "q": " ".join(words[: rng.randint(1, len(words))])}
+
+
+def deep_page(rng: random.Random) -> dict:
+    return {**rss(rng), "offset": rng.choice([50, 100, 150])}
+
+
+KINDS = {
+    "rss": rss,
+    "tvsearch": tvsearch,
+    "movie": movie,
+    "interactive": interactive,
+    "deep": deep_page,
+    "download": None,  # id tiré parmi les résultats déjà reçus
+}
+
+# Mélanges de charge : poids par type de requête
+MIXES = {
+    "prowlarr": {"rss": 8, "interactive": 1, "deep": 1},
+    "sonarr": {"rss": 3, "tvsearch": 6, "download": 1},
+    "radarr": {"rss": 3, "movie": 6, "download": 1},
+    "mixed": {"rss": 4, "tvsearch": 3, "movie": 2, "interactive": 1, "deep": 1, "download": 1},
+}
+
+
+_DOWNLOAD_ID_RE = re.compile(r"download\?id=(\d+)")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_load(base_url: str, mix: dict, total: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    plan = rng.choices(kinds, weights=weights, k=total)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    seen_ids: list[str] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for kind in plan:
+        queue.put_nowait(kind)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            kind = queue.get_nowait()
+            if kind == "download":
+                if not seen_ids:
+                    kind = "rss"
+                else:
+                    url, params = "/download", {"id": rng.choice(seen_ids)}
+            if kind != "download":
+                url, params = "/api", KINDS[kind](rng)
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, params=params)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+                response = None
+            latencies[kind].append(time.perf_counter() - started)
+            if not ok:
+                errors[kind] += 1
+            elif kind != "download":
+                seen_ids.extend(_DOWNLOAD_ID_RE.findall(response.text))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "latencies": latencies, "errors": errors}
+
+
+def report(result: dict, upstream: dict) -> None:
+    latencies, errors = result["latencies"], result["errors"]
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n{'type':<12} {'n':>6} {'err':>5} {'p50 ms':>9} {'p99 ms':>9}")
+    for kind, values in sorted(latencies.items()):
+        print(f"{kind:<12} {len(values):>6} {errors[kind]:>5} "
+              f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+    every = [v for values in latencies.values() for v in values]
+    print(f"{'total':<12} {total:>6} {sum(errors.values()):>5} "
+          f"{percentile(every, 50) * 1000:>9.1f} {percentile(every, 99) * 1000:>9.1f}")
+    print(f"\nthroughput: {total / result['elapsed']:.1f} req/s over {result['elapsed']:.2f}s")
+    print(
+        f"upstream: {upstream.get('api', 0)} API requests "
+        f"({upstream.get('429', 0)} x 429, {upstream.get('api', 0) / max(total, 1):.2f} per request), "
+        f"{upstream.get('login', 0)} logins, {upstream.get('download', 0)} downloads"
+    )
+
+
+def main_bench() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="variable d'environnement passée au proxy (répétable)")
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--profile", default="poisson")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--session-ttl", type=float, default=0.0)
+    parser.add_argument("--proxy-log", help="fichier recevant les logs du proxy")
+    args = parser.parse_args()
+
+    gf_port, proxy_port = free_port(), free_port()
+    gf_url, proxy_url = f"http://127.0.0.1:{gf_port}", f"http://127.0.0.1:{proxy_port}"
+
+    env = {
+        **os.environ,
+        "GF_BASE_URL": gf_url,
+        "GF_API_TOKEN": "bench-token-0123456789",
+        "GF_USERNAME": "bench",
+        "GF_PASSWORD": "bench",
+        "GF_OTP": "JBSWY3DPEHPK3PXP",
+        "TORRENT_CACHE_DIR": "",
+    }
+    env.update(item.split("=", 1) for item in args.env)
+
+    fake_cmd = [
+        sys.executable, os.path.join(BENCH_DIR, "fake_gf.py"), "--port", str(gf_port),
+        "--items", str(args.items), "--profile", args.profile, "--latency", str(args.latency),
+        "--jitter", str(args.jitter), "--rate-limit", str(args.rate_limit),
+        "--session-ttl", str(args.session_ttl),
+    ]
+    proxy_cmd = [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+        "--port", str(proxy_port), "--log-level", "warning", "--no-access-log",
+    ]
+    fake = subprocess.Popen(fake_cmd)
+    proxy = subprocess.Popen(proxy_cmd, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL,
+                             stderr=open(args.proxy_log, "w") if args.proxy_log else subprocess.DEVNULL)
+    try:
+        wait_ready(f"{gf_url}/_stats")
+        wait_ready(f"{proxy_url}/health")
+        httpx.post(f"{gf_url}/_reset")
+
+        print(f"mix={args.mix} requests={args.requests} concurrency={args.concurrency} "
+              f"latency={args.latency}s rate_limit={args.rate_limit}")
+        result = asyncio.run(run_load(proxy_url, MIXES[args.mix], args.requests, args.concurrency, args.seed))
+        report(result, httpx.get(f"{gf_url}/_stats").json())
+    finally:
+        for process in (proxy, fake):
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,247 @@
+"""
+Faux serveur GF pour les benchmarks hors ligne (aucun trafic vers le vrai tracker).
+
+Sert /api/torrents/filter (plus récents d'abord, 25 par page, filtres name /
+imdbId / categories[] / seasonNumber / episodeNumber) avec une distribution
+d'âges, une latence et une limite de débit (429 + Retry-After) configurables,
+ainsi que le parcours web login -> 2FA -> /torrents/download/{id}.
+
+Compteurs : GET /_stats ; remise à zéro : POST /_reset ;
+expiration des sessions web : POST /_expire.
+
+Usage : python bench/fake_gf.py [--port 9911] [--items 5000] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+
+GF_CATEGORIES = (1, 1, 1, 2, 2, 2, 2, 18, 17, 3, 5, 6)
+
+SHOWS = [
+    "The.Last.Watch", "Blue.Harbor", "Night.Shift", "Silent.Valley", "Paper.Crowns",
+    "Iron.Garden", "Cold.Case.Files", "Lost.Signals", "Open.Road", "Deep.Waters",
+]
+
+app = FastAPI()
+
+settings = argparse.Namespace(
+    items=5000, interval=8.0, profile="poisson", latency=0.0, jitter=0.0,
+    rate_limit=0, window=10.0, retry_after=2, session_ttl=0.0, seed=42,
+)
+torrents: list[dict] = []
+stats: Counter = Counter()
+_hits: deque = deque()
+_sessions: dict[str, float] = {}
+
+
+def build_catalog() -> list[dict]:
+    """
+    Generate the catalog, newest first. `interval` is the mean gap between
+    uploads in minutes: fixed with the "steady" profile, exponential with
+    "poisson", and with "evening" most uploads land between 18h and 23h.
+    """
+    rng = random.Random(settings.seed)
+    now = time.time()
+    created = now - rng.uniform(0, settings.interval * 60)
+    items = []
+    for i in range(settings.items):
+        if settings.profile == "steady":
+            gap = settings.interval * 60
+        else:
+            gap = rng.expovariate(1 / (settings.interval * 60))
+            if settings.profile == "evening" and not 18 <= datetime.fromtimestamp(created).hour <= 23:
+                gap *= 3
+        created -= gap
+
+        category = rng.choice(GF_CATEGORIES)
+        show = rng.randrange(len(SHOWS))
+        season, episode = rng.randint(1, 6), rng.randint(1, 12)
+        name = (
+            f"{SHOWS[show]}.S{season:02d}E{episode:02d}.MULTi.1080p.WEB.H264-GRP"
+            if category in (2, 18) else f"{SHOWS[show]}.{2000 + show}.MULTi.1080p.BluRay.x264-GRP"
+        )
+        items.append({
+            "id": str(900000 - i),
+            "type": "torrents",
+            "attributes": {
+                "name": name,
+                "created_at": datetime.fromtimestamp(created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000000Z"),
+                "size": rng.randint(300, 20000) * 1_000_000,
+                "seeders": rng.randint(0, 200),
+                "leechers": rng.randint(0, 20),
+                "times_completed": rng.randint(0, 500),
+                "category_id": category,
+                "type_id": 1,
+                "resolution_id": 3,
+                "info_hash": f"{rng.getrandbits(160):040x}",
+                "freeleech": rng.choice(["0%", "0%", "25%", "100%"]),
+                "imdb_id": str(1000000 + show),
+                "tmdb_id": 50000 + show,
+                "season_number": season if category in (2, 18) else None,
+                "episode_number": episode if category in (2, 18) else None,
+                "description": "Lorem ipsum dolor sit amet. " * 40,
+                "uploader": "bench",
+                "download_link": f"/torrents/download/{900000 - i}",
+            },
+        })
+    return items
+
+
+def _matches(torrent: dict, name: str, imdb: str, categories: set, season: str, episode: str) -> bool:
+    attrs = torrent["attributes"]
+    if name and not all(word in attrs["name"].lower() for word in name.lower().split()):
+        return False
+    if imdb and attrs["imdb_id"] != imdb:
+        return False
+    if categories and attrs["category_id"] not in categories:
+        return False
+    if season and attrs["season_number"] != int(season):
+        return False
+    if episode and attrs["episode_number"] != int(episode):
+        return False
+    return True
+
+
+@app.get("/api/torrents/filter")
+async def torrents_filter(request: Request):
+    stats["api"] += 1
+    now = time.monotonic()
+    if settings.rate_limit:
+        while _hits and _hits[0] <= now - settings.window:
+            _hits.popleft()
+        if len(_hits) >= settings.rate_limit:
+            stats["429"] += 1
+            return JSONResponse({"message": "Too Many Attempts."}, status_code=429,
+                                headers={"Retry-After": str(settings.retry_after)})
+        _hits.append(now)
+
+    if settings.latency:
+        await asyncio.sleep(max(0.0, random.gauss(settings.latency, settings.jitter)))
+
+    q = request.query_params
+    page = int(q.get("page", 1))
+    per_page = int(q.get("perPage", 25))
+    categories = {int(v) for k, v in q.multi_items() if k.startswith("categories")}
+    matched = [
+        t for t in torrents
+        if _matches(t, q.get("name", ""), q.get("imdbId", ""), categories,
+                    q.get("seasonNumber", ""), q.get("episodeNumber", ""))
+    ]
+    stats["pages"] += 1
+    return {"data": matched[(page - 1) * per_page:page * per_page]}
+
+
+def _session_ok(request: Request) -> bool:
+    started = _sessions.get(request.cookies.get("gf_session", ""))
+    if started is None:
+        return False
+    return not settings.session_ttl or time.monotonic() - started < settings.session_ttl
+
+
+@app.get("/login")
+async def login_page():
+    stats["login_page"] += 1
+    html = (
+        '<form method="post"><input name="_token" value="csrf-token">'
+        '<input name="_captcha" value="captcha">'
+        '<input type="hidden" name="ts_field" value="1700000000"></form>'
+    )
+    return Response(html, media_type="text/html")
+
+
+@app.post("/login")
+async def login_post():
+    stats["login"] += 1
+    sid = secrets.token_hex(8)
+    _sessions[sid] = -1.0  # en attente de la 2FA
+    response = Response("<p>Verifying...</p>", media_type="text/html")
+    response.set_cookie("gf_session", sid)
+    return response
+
+
+@app.post("/two-factor-challenge")
+async def two_factor(request: Request):
+    stats["2fa"] += 1
+    sid = request.cookies.get("gf_session", "")
+    if sid not in _sessions:
+        return Response("<p>Login</p>", media_type="text/html", status_code=401)
+    _sessions[sid] = time.monotonic()
+    return Response('<a href="/logout">Logout</a>', media_type="text/html")
+
+
+@app.get("/torrents/download/{torrent_id}")
+async def download(torrent_id: str, request: Request):
+    stats["download"] += 1
+    if not _session_ok(request):
+        stats["download_logged_out"] += 1
+        return RedirectResponse("/login", status_code=302)
+    if settings.latency:
+        await asyncio.sleep(max(0.0, random.gauss(settings.latency, settings.jitter)))
+    name = f"{torrent_id}.mkv".encode()
+    pieces = bytes(random.Random(torrent_id).getrandbits(8) for _ in range(20 * 64))
+    body = (
+        b"d8:announce30:https://tracker.example/announce4:info"
+        b"d6:lengthi1073741824e4:name" + str(len(name)).encode() + b":" + name
+        + b"12:piece lengthi16777216e6:pieces" + str(len(pieces)).encode() + b":" + pieces + b"ee"
+    )
+    return Response(body, media_type="application/x-bittorrent",
+                    headers={"Content-Disposition": f'attachment; filename="{torrent_id}.torrent"'})
+
+
+@app.get("/_stats")
+async def get_stats():
+    return dict(stats)
+
+
+@app.post("/_reset")
+async def reset():
+    stats.clear()
+    _hits.clear()
+    return {}
+
+
+@app.post("/_expire")
+async def expire():
+    _sessions.clear()
+    return {}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9911)
+    parser.add_argument("--items", type=int, default=settings.items, help="taille du catalogue")
+    parser.add_argument("--interval", type=float, default=settings.interval,
+                        help="écart moyen entre deux uploads (minutes)")
+    parser.add_argument("--profile", choices=("steady", "poisson", "evening"), default=settings.profile)
+    parser.add_argument("--latency", type=float, default=settings.latency, help="latence moyenne (s)")
+    parser.add_argument("--jitter", type=float, default=settings.jitter, help="écart-type de la latence (s)")
+    parser.add_argument("--rate-limit", type=int, default=settings.rate_limit,
+                        help="requêtes API max par fenêtre avant 429 (0 = illimité)")
+    parser.add_argument("--window", type=float, default=settings.window, help="fenêtre du rate limit (s)")
+    parser.add_argument("--retry-after", type=int, default=settings.retry_after)
+    parser.add_argument("--session-ttl", type=float, default=settings.session_ttl,
+                        help="durée de vie des sessions web (s, 0 = infinie)")
+    parser.add_argument("--seed", type=int, default=settings.seed)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    import uvicorn
+
+    args = parse_args()
+    vars(settings).update({k: v for k, v in vars(args).items() if k in vars(settings)})
+    torrents[:] = build_catalog()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,22 +6,44 @@ torrents de plus de 36h, évitant les erreurs 403 sur les téléchargements auto
 """
 
 import asyncio
+import hashlib
+import heapq
+import json
 import logging
+import mmap
 import os
+import random
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterator, Optional
 from xml.etree import ElementTree as ET
 
 import httpx
 from dateutil import parser as date_parser
 from fastapi import FastAPI, Query, Response, HTTPException
-from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 
-import requests
 from bs4 import BeautifulSoup
 import re
 import pyotp
 
+# Décodage rapide des pages GF (optionnel) : msgspec, sinon orjson, sinon json
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration - variables d'environnement avec fallback config.py
 # Priorité : 1) Variables d'environnement  2) config.py  3) Valeurs par défaut
 try:
@@ -75,9 +97,86 @@ MIN_AGE_HOURS = int(os.getenv("MIN_AGE_HOURS", str(_MIN_AGE_HOURS)))
 MAX_PAGES = int(os.getenv("MAX_PAGES", str(_MAX_PAGES)))
 RESULTS_LIMIT = int(os.getenv("RESULTS_LIMIT", str(_RESULTS_LIMIT)))
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(_CACHE_TTL_SECONDS)))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", "0"))  # 0 = pas de limite en octets
+# Stale-while-revalidate : durée pendant laquelle un résultat expiré reste servi (0 = désactivé)
+CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", "600"))
+# Rafraîchissement proactif des K clés les plus demandées avant expiration (0 = désactivé)
+CACHE_REFRESH_TOP_K = int(os.getenv("CACHE_REFRESH_TOP_K", "0"))
+CACHE_REFRESH_MARGIN = int(os.getenv("CACHE_REFRESH_MARGIN", "60"))
+# Partage des résultats entre tokens API (les résultats GF ne dépendent pas du token),
+# uniquement pour les tokens déjà acceptés par GF (ou GF_API_TOKEN)
+CACHE_SHARE_ACROSS_TOKENS = os.getenv("CACHE_SHARE_ACROSS_TOKENS", "true").lower() in ("1", "true", "yes")
+# Cache partagé entre workers/conteneurs : memory (par processus), sqlite ou redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+# Chemin du fichier SQLite ou URL Redis (redis://host:6379/0)
+CACHE_BACKEND_URL = os.getenv("CACHE_BACKEND_URL", "")
+# Attente max (s) d'une recherche déjà lancée par un autre worker avant de la refaire soi-même
+CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "30"))
 LISTEN_HOST = os.getenv("LISTEN_HOST", _LISTEN_HOST)
 LISTEN_PORT = int(os.getenv("LISTEN_PORT", str(_LISTEN_PORT)))
 
+# Sessions web GF réutilisées pour /download (login + 2FA seulement à l'expiration)
+WEB_SESSION_POOL_SIZE = int(os.getenv("WEB_SESSION_POOL_SIZE", "1"))
+
+# Cache disque des fichiers .torrent téléchargés ("" = désactivé)
+TORRENT_CACHE_DIR = os.getenv("TORRENT_CACHE_DIR", "torrent-cache")
+TORRENT_CACHE_MAX_BYTES = int(os.getenv("TORRENT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Préchargement des .torrent des flux RSS renvoyés (nécessite TORRENT_CACHE_DIR)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() in ("1", "true", "yes")
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "5"))
+PREFETCH_CATEGORIES = [int(c) for c in os.getenv("PREFETCH_CATEGORIES", "").split(",") if c.strip()]
+PREFETCH_MIN_SEEDERS = int(os.getenv("PREFETCH_MIN_SEEDERS", "0"))
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "2.0"))
+PREFETCH_QUEUE_SIZE = int(os.getenv("PREFETCH_QUEUE_SIZE", "100"))
+
+# Cache des fragments XML <item> déjà rendus (0 = désactivé)
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "5000"))
+
+# Ordonnanceur global des requêtes vers GF (token bucket, ~10 requêtes avant 429)
+GF_RATE_LIMIT = float(os.getenv("GF_RATE_LIMIT", "1.0"))    # requêtes/s en régime établi
+GF_RATE_BURST = int(os.getenv("GF_RATE_BURST", "5"))        # rafale max
+GF_MAX_RETRIES = int(os.getenv("GF_MAX_RETRIES", "3"))      # nouvelles tentatives après un 429
+GF_BACKOFF_BASE = float(os.getenv("GF_BACKOFF_BASE", "5"))  # backoff exponentiel sans Retry-After
+GF_BACKOFF_MAX = float(os.getenv("GF_BACKOFF_MAX", "60"))
+
+# Client HTTP partagé vers l'API GF (pool de connexions keep-alive)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "10"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "5"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_WRITE_TIMEOUT = float(os.getenv("HTTP_WRITE_TIMEOUT", "10"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+
+# Stratégie de pagination : "frontier" (recherche galopante) ou "linear"
+SEARCH_STRATEGY = os.getenv("SEARCH_STRATEGY", "frontier")
+# Pages demandées en parallèle une fois la page de départ connue (1 = séquentiel)
+SEARCH_FANOUT = int(os.getenv("SEARCH_FANOUT", "1"))
+# Torrents trop récents suivis pour être ajoutés aux résultats en cache dès qu'ils deviennent éligibles (0 = désactivé)
+HORIZON_MAX_ENTRIES = int(os.getenv("HORIZON_MAX_ENTRIES", "5000"))
+# RSS incrémental : les polls sans recherche ne récupèrent que les pages plus récentes que le dernier torrent vu
+RSS_DELTA_ENABLED = os.getenv("RSS_DELTA_ENABLED", "false").lower() in ("1", "true", "yes")
+RSS_DELTA_MAX_PAGES = int(os.getenv("RSS_DELTA_MAX_PAGES", "5"))  # au-delà : resynchronisation complète
+RSS_RESYNC_SECONDS = int(os.getenv("RSS_RESYNC_SECONDS", "3600"))  # resynchronisation complète périodique
+# Regroupement des recherches IMDb simultanées d'une même saison (épisodes Sonarr) en une requête GF (0 = désactivé)
+BATCH_WINDOW_MS = int(os.getenv("BATCH_WINDOW_MS", "0"))
+# Instantané du cache (résultats, pages frontière, fenêtres RSS) pour redémarrer à chaud
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes")
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "gf-snapshot.bin")
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "300"))  # secondes entre deux sauvegardes
+# Profondeur max (en pages GF) atteignable en paginant avec offset
+DEEP_PAGING_MAX_PAGES = int(os.getenv("DEEP_PAGING_MAX_PAGES", "100"))
+
+# Index local SQLite alimenté en tâche de fond (désactivé par défaut)
+INDEX_ENABLED = os.getenv("INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+INDEX_PATH = os.getenv("INDEX_PATH", "gf-index.db")
+INDEX_CRAWL_INTERVAL = int(os.getenv("INDEX_CRAWL_INTERVAL", "600"))
+INDEX_CRAWL_PAGES = int(os.getenv("INDEX_CRAWL_PAGES", "10"))
+INDEX_BACKFILL_PAGES = int(os.getenv("INDEX_BACKFILL_PAGES", "5"))
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -85,37 +184,587 @@ logging.basicConfig(
 )
 logger = logging.getLogger("gf-free-proxy")
 
+# Shared upstream HTTP client (one per process, bound to the app lifespan)
+_http_client: Optional[httpx.AsyncClient] = None
+_http_stats = {"requests": 0, "connections_opened": 0}
+
+
+async def _trace_connection(event_name: str, info: dict) -> None:
+    """httpcore trace hook: count new TCP connections to measure reuse."""
+    if event_name == "connection.connect_tcp.complete":
+        _http_stats["connections_opened"] += 1
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """Count outgoing requests and attach the connection tracer."""
+    _http_stats["requests"] += 1
+    request.extensions["trace"] = _trace_connection
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled keep-alive client used for all GF API traffic."""
+    http2 = HTTP2_ENABLED
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=HTTP_CONNECT_TIMEOUT,
+            read=HTTP_READ_TIMEOUT,
+            write=HTTP_WRITE_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT,
+        ),
+        event_hooks={"request": [_on_request]},
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifespan."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+def http_pool_stats() -> dict:
+    """Connection pool statistics for /health."""
+    requests_sent = _http_stats["requests"]
+    opened = _http_stats["connections_opened"]
+    open_connections = 0
+    idle_connections = 0
+    if _http_client is not None and not _http_client.is_closed:
+        pool = getattr(_http_client._transport, "_pool", None)
+        for conn in getattr(pool, "connections", []):
+            open_connections += 1
+            if conn.is_idle():
+                idle_connections += 1
+
+    return {
+        "http2": HTTP2_ENABLED,
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive": HTTP_MAX_KEEPALIVE,
+        "open_connections": open_connections,
+        "idle_connections": idle_connections,
+        "requests": requests_sent,
+        "connections_opened": opened,
+        "reuse_ratio": round(1 - opened / requests_sent, 3) if requests_sent else 0.0,
+    }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream client, cache backend and index crawler on startup, close them on shutdown."""
+    global _http_client, torrent_index, torrent_cache
+    _http_client = create_http_client()
+    if torrent_cache is not None and not await asyncio.to_thread(torrent_cache.writable):
+        logger.warning(f"Torrent cache directory {TORRENT_CACHE_DIR!r} is not writable, disk cache disabled")
+        torrent_cache = None
+    search_cache.backend = create_cache_backend()
+    if SNAPSHOT_ENABLED:
+        search_cache.snapshot = load_snapshot(SNAPSHOT_PATH)
+    background = []
+    if INDEX_ENABLED and not GF_API_TOKEN:
+        # The crawler never borrows a Prowlarr user's apikey
+        logger.warning("INDEX_ENABLED requires GF_API_TOKEN, local index disabled")
+    elif INDEX_ENABLED:
+        torrent_index = TorrentIndex(INDEX_PATH)
+        background.append(asyncio.create_task(run_index_crawler(torrent_index)))
+    if CACHE_REFRESH_TOP_K > 0:
+        background.append(asyncio.create_task(run_cache_refresher(search_cache)))
+    if PREFETCH_ENABLED and torrent_cache is not None:
+        background.append(asyncio.create_task(run_prefetcher()))
+    if SNAPSHOT_ENABLED and SNAPSHOT_INTERVAL > 0:
+        background.append(asyncio.create_task(run_snapshot_saver()))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if SNAPSHOT_ENABLED:
+            try:
+                saved = await save_snapshot(SNAPSHOT_PATH)
+                logger.info(f"Saved snapshot ({saved} cache entries)")
+            except Exception as e:
+                logger.warning(f"Snapshot save failed: {e}")
+        if search_cache.snapshot is not None:
+            search_cache.snapshot.close()
+            search_cache.snapshot = None
+        if torrent_index is not None:
+            torrent_index.close()
+            torrent_index = None
+        if search_cache.backend is not None:
+            search_cache.backend.close()
+            search_cache.backend = None
+        await web_sessions.aclose()
+        await _http_client.aclose()
+        _http_client = None
+
+
 # FastAPI app
 app = FastAPI(
     title="GF-Free Proxy",
     description="Torznab proxy for Generation-Free with 36h age filter",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Simple in-memory cache
-_cache: dict[str, tuple[datetime, list]] = {}
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback for TorrentRecord (and anything else, as str)."""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+class _CacheEntry:
+    __slots__ = ("expires_at", "value", "size", "hits", "fetch")
+
+    def __init__(self, expires_at: float, value: Any, size: int, fetch: Optional[Callable] = None):
+        self.expires_at = expires_at
+        self.value = value
+        self.size = size
+        self.hits = 0
+        self.fetch = fetch
 
 
-def get_cached(key: str) -> Optional[list]:
-    """Get cached results if not expired."""
-    if key in _cache:
-        cached_time, data = _cache[key]
-        age = (datetime.now(timezone.utc) - cached_time).total_seconds()
-        if age < CACHE_TTL_SECONDS:
-            logger.debug(f"Cache hit for {key[:50]}... (age: {age:.0f}s)")
-            return data
+class TTLCache:
+    """
+    Bounded LRU + TTL cache with request coalescing and stale-while-revalidate.
+
+    Entries live in an OrderedDict kept in LRU order; deadlines go in a min-heap
+    (stale heap items are skipped lazily), since values imported from a snapshot
+    or the shared backend keep their own expiry. LRU eviction pops from the front
+    of the OrderedDict and expiry from the top of the heap.
+    Concurrent get_or_fetch() calls on the same key share a single fetch.
+
+    With stale_ttl > 0, an expired entry is still served for stale_ttl seconds
+    while get_or_fetch() refreshes it in the background.
+
+    With a shared backend (see create_cache_backend), fills first look for a
+    fresh value stored by another worker, and take a cross-worker lock so only
+    one of them fetches a given key; `encode`/`decode` convert values to bytes.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 100,
+        max_bytes: int = 0,
+        stale_ttl: float = 0,
+        encode: Optional[Callable[[Any], bytes]] = None,
+        decode: Optional[Callable[[bytes], Any]] = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = None
+        self.snapshot: Optional["WarmSnapshot"] = None
+        self.restored = 0
+        self.encode = encode
+        self.decode = decode
+        self.shared_hits = 0
+        self.shared_waits = 0
+        self.shared_errors = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._deadlines: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        del self._deadlines[key]
+        self.bytes -= entry.size
+
+    def _purge_expired(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            deadline, key = heapq.heappop(self._expiry)
+            if self._deadlines.get(key) == deadline:
+                self._remove(key)
+                self.expirations += 1
+
+    def _lookup(self, key: str) -> Optional[_CacheEntry]:
+        now = time.time()
+        self._purge_expired(now)
+        entry = self._entries.get(key)
+        if entry is None and self.snapshot is not None:
+            entry = self._restore(key, now)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.hits += 1
+        return entry
+
+    def _restore(self, key: str, now: float) -> Optional[_CacheEntry]:
+        """Decode a key from the warm snapshot on first access, keeping its expiry."""
+        taken = self.snapshot.take(key)
+        if taken is None:
+            return None
+        data, expires_at = taken
+        if expires_at + self.stale_ttl <= now:
+            return None
+        try:
+            value = self.decode(data)
+        except Exception as e:
+            logger.warning(f"Unreadable snapshot entry {key}: {e}")
+            return None
+        self.set(key, value, expires_at=expires_at)
+        self.restored += 1
+        return self._entries.get(key)
+
+    def snapshot_items(self) -> Iterator[tuple[str, bytes, float]]:
+        """(key, encoded value, expires_at) of every live entry, including snapshot entries not read yet."""
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if self._deadlines[key] > now:
+                yield key, self.encode(entry.value), entry.expires_at
+        if self.snapshot is not None:
+            for key in self.snapshot.keys():
+                if key in self._entries:
+                    continue
+                taken = self.snapshot.peek(key)
+                if taken is not None and taken[1] + self.stale_ttl > now:
+                    yield key, taken[0], taken[1]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._lookup(key)
+        if entry is None or entry.expires_at <= time.time():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def set(
+        self, key: str, value: Any, fetch: Optional[Callable] = None, expires_at: Optional[float] = None
+    ) -> None:
+        """Store a value, evicting least recently used entries past the bounds."""
+        now = time.time()
+        if expires_at is None:
+            expires_at = now + self.ttl
+        hits = 0
+        if key in self._entries:
+            old = self._entries[key]
+            hits = old.hits
+            fetch = fetch or old.fetch
+            self._remove(key)
+        size = len(json.dumps(value, default=_json_default)) if self.max_bytes else 0
+        entry = _CacheEntry(expires_at, value, size, fetch)
+        # Keep half of the popularity across refreshes so hot keys stay hot
+        entry.hits = hits // 2
+        self._entries[key] = entry
+        self._deadlines[key] = expires_at + self.stale_ttl
+        heapq.heappush(self._expiry, (expires_at + self.stale_ttl, key))
+        self.bytes += size
+        if len(self._expiry) > 2 * len(self._deadlines) + 64:
+            # Drop the heap items left behind by replaced and evicted entries
+            self._expiry = [(deadline, k) for k, deadline in self._deadlines.items()]
+            heapq.heapify(self._expiry)
+
+        self._purge_expired(now)
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes and self.bytes > self.max_bytes and len(self._entries) > 1
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value or run fetch(), sharing one fetch per key."""
+        entry = self._lookup(key)
+        if entry is not None:
+            if entry.expires_at > time.time():
+                self.hits += 1
+                return entry.value
+            # Stale: serve it now, refresh in the background
+            self.stale_hits += 1
+            self.refresh(key, fetch)
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
         else:
-            del _cache[key]
+            self.misses += 1
+            task = self._start_fill(key, fetch)
+        # Shield so that one client disconnecting does not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def refresh(self, key: str, fetch: Optional[Callable[[], Awaitable[Any]]] = None) -> None:
+        """Refresh a key in the background (no-op if a fetch is already running)."""
+        if key in self._inflight:
+            return
+        entry = self._entries.get(key)
+        fetch = fetch or (entry.fetch if entry is not None else None)
+        if fetch is None:
+            return
+        self.refreshes += 1
+        task = self._start_fill(key, fetch)
+        task.add_done_callback(_log_refresh_error)
+
+    def _start_fill(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.create_task(self._fill(key, fetch))
+        self._inflight[key] = task
+        return task
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            if self.backend is not None:
+                return await self._fill_shared(key, fetch)
+            value = await fetch()
+            self.set(key, value, fetch)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fill_shared(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Fill from the shared backend, or fetch under a cross-worker lock."""
+        deadline = time.monotonic() + CACHE_LOCK_TIMEOUT
+        locked = False
+        try:
+            while True:
+                shared = await self._shared_call(self.backend.load, key)
+                if shared is not None:
+                    data, expires_at = shared
+                    value = self.decode(data)
+                    self.shared_hits += 1
+                    self.set(key, value, fetch, expires_at)
+                    return value
+                locked = await self._shared_call(self.backend.try_lock, key, CACHE_LOCK_TIMEOUT)
+                # Backend errors (None) and lock timeouts fall back to a local fetch
+                if locked is not False or time.monotonic() >= deadline:
+                    break
+                # Another worker is fetching this key: wait for its result
+                self.shared_waits += 1
+                await asyncio.sleep(0.1)
+
+            value = await fetch()
+            self.set(key, value, fetch)
+            expires_at = self._entries[key].expires_at if key in self._entries else time.time() + self.ttl
+            await self._shared_call(self.backend.store, key, self.encode(value), expires_at)
+            return value
+        finally:
+            if locked:
+                await self._shared_call(self.backend.unlock, key)
+
+    async def _shared_call(self, method: Callable, *args) -> Any:
+        """Run a (blocking) backend call off the event loop; None if the backend failed."""
+        try:
+            return await asyncio.to_thread(method, *args)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache backend error: {e}")
+            return None
+
+    def refresh_hot(self, top_k: int, margin: float) -> int:
+        """Proactively refresh the top_k most hit keys expiring within margin seconds."""
+        deadline = time.time() + margin
+        candidates = [
+            (entry.hits, key) for key, entry in self._entries.items()
+            if entry.hits and entry.expires_at <= deadline and entry.fetch is not None
+        ]
+        hot = sorted(candidates, reverse=True)[:top_k]
+        for _, key in hot:
+            self.refresh(key)
+        return len(hot)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "backend": self.backend.stats() if self.backend is not None else None,
+            "shared_hits": self.shared_hits,
+            "shared_waits": self.shared_waits,
+            "shared_errors": self.shared_errors,
+            "restored": self.restored,
+            "snapshot_pending": len(self.snapshot) if self.snapshot is not None else 0,
+        }
+
+
+def _log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background cache refresh failed: {task.exception()}")
+
+
+async def run_cache_refresher(cache: TTLCache) -> None:
+    """Background task: keep hot search keys warm before they expire."""
+    interval = max(5, CACHE_REFRESH_MARGIN // 2)
+    while True:
+        await asyncio.sleep(interval)
+        refreshed = cache.refresh_hot(CACHE_REFRESH_TOP_K, CACHE_REFRESH_MARGIN)
+        if refreshed:
+            logger.info(f"Proactively refreshing {refreshed} hot cache keys")
+
+
+# === SHARED CACHE BACKENDS ===
+
+class SQLiteCacheBackend:
+    """
+    Cache shared by the workers of one host, in a SQLite file (WAL).
+
+    Values are stored with their expiry time; in-flight locks are rows with a
+    deadline, so a crashed worker cannot hold a key forever.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.path = path
+        self.owner = f"{os.getpid()}-{random.getrandbits(32):08x}"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+        """)
+        self._db.commit()
+        self._stores = 0
+
+    def load(self, key: str) -> Optional[tuple[bytes, float]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def store(self, key: str, data: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", (key, data, expires_at)
+            )
+            self._stores += 1
+            if self._stores % 100 == 0:
+                self._db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    def try_lock(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                """INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                   WHERE locks.expires_at <= ?""",
+                (key, self.owner, now + ttl, now),
+            )
+            self._db.commit()
+            return cursor.rowcount > 0
+
+    def unlock(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, self.owner))
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM cache WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+        return {"type": "sqlite", "path": self.path, "entries": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RedisCacheBackend:
+    """Cache shared by several hosts/containers through Redis (needs the redis package)."""
+
+    _UNLOCK = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str):
+        import redis
+
+        self.url = url
+        self.owner = f"{os.getpid()}-{random.getrandbits(32):08x}"
+        self._redis = redis.Redis.from_url(url)
+
+    def load(self, key: str) -> Optional[tuple[bytes, float]]:
+        raw = self._redis.get(f"gfproxy:cache:{key}")
+        if raw is None:
+            return None
+        # Values are stored as "<expires_at>\n<data>"
+        header, _, data = raw.partition(b"\n")
+        return data, float(header)
+
+    def store(self, key: str, data: bytes, expires_at: float) -> None:
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            self._redis.set(f"gfproxy:cache:{key}", f"{expires_at:.3f}\n".encode() + data, px=ttl_ms)
+
+    def try_lock(self, key: str, ttl: float) -> bool:
+        return bool(self._redis.set(f"gfproxy:lock:{key}", self.owner, nx=True, px=int(ttl * 1000)))
+
+    def unlock(self, key: str) -> None:
+        self._redis.eval(self._UNLOCK, 1, f"gfproxy:lock:{key}", self.owner)
+
+    def stats(self) -> dict:
+        return {"type": "redis", "url": self.url.split("@")[-1]}
+
+    def close(self) -> None:
+        self._redis.close()
+
+
+def create_cache_backend() -> Optional[Any]:
+    """Shared backend selected by CACHE_BACKEND (None = in-process cache only)."""
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(CACHE_BACKEND_URL or "gf-cache.db")
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(CACHE_BACKEND_URL or "redis://localhost:6379/0")
+    if CACHE_BACKEND != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}, using the in-process cache")
     return None
 
 
-def set_cache(key: str, data: list) -> None:
-    """Store results in cache."""
-    _cache[key] = (datetime.now(timezone.utc), data)
-    # Cleanup old entries (keep max 100)
-    if len(_cache) > 100:
-        oldest_key = min(_cache.keys(), key=lambda k: _cache[k][0])
-        del _cache[oldest_key]
+def _encode_result_set(results: "ResultSet") -> bytes:
+    return json.dumps(results.to_dict(), default=_json_default).encode()
+
+
+def _decode_result_set(data: bytes) -> "ResultSet":
+    fields = json.loads(data)
+    return ResultSet(
+        [TorrentRecord(**item) for item in fields["items"]],
+        fields.get("params"),
+        fields.get("priority", PRIORITY_INTERACTIVE),
+        fields.get("next_page"),
+    )
+
+
+# Search results cache
+search_cache = TTLCache(
+    CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_STALE_SECONDS,
+    encode=_encode_result_set, decode=_decode_result_set,
+)
 
 
 def escape_xml(text: str) -> str:
@@ -131,206 +780,1638 @@ def escape_xml(text: str) -> str:
     )
 
 
-def is_torrent_eligible(torrent: dict, min_age_hours: int = MIN_AGE_HOURS) -> bool:
-    """Check if torrent is old enough (>= min_age_hours)."""
-    created_at_str = torrent.get("attributes", {}).get("created_at")
-    if not created_at_str:
-        return False
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a GF created_at string to a UTC epoch.
 
+    GF sends ISO-8601 timestamps, which datetime.fromisoformat handles natively
+    and much faster than dateutil; dateutil stays as the fallback.
+    """
+    if not value:
+        return None
     try:
-        created_at = date_parser.parse(created_at_str)
-        if created_at.tzinfo is None:
-            created_at = created_at.replace(tzinfo=timezone.utc)
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        created_at = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            created_at = date_parser.parse(value)
+        except Exception as e:
+            logger.warning(f"Failed to parse date {value}: {e}")
+            return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+_SEASON_EPISODE_RE = re.compile(r"\bS(\d{1,2})(?:E(\d{1,3}))?\b", re.IGNORECASE)
+
+
+def _to_int(value) -> Optional[int]:
+    """Best-effort int conversion for GF ids ("tt0123", "42", 42, None)."""
+    if value is None:
+        return None
+    if type(value) is int:
+        return value
+    digits = str(value).replace("tt", "")
+    return int(digits) if digits.isdigit() else None
+
+
+@dataclass(frozen=True, slots=True)
+class TorrentRecord:
+    """The fields of a GF torrent the proxy actually uses, built once at ingest."""
+
+    id: str
+    name: str
+    created_ts: Optional[float]
+    size: int = 0
+    seeders: int = 0
+    leechers: int = 0
+    category_id: Optional[int] = None
+    info_hash: Optional[str] = None
+    freeleech: Optional[str] = "0%"
+    imdb_id: Optional[str] = None
+    tmdb_id: Optional[int] = None
+    season: Optional[int] = None
+    episode: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _season_episode(name: str, season_number: Any, episode_number: Any) -> tuple[Optional[int], Optional[int]]:
+    """GF season/episode numbers, or SxxEyy parsed from the name when GF has none."""
+    season = _to_int(season_number)
+    episode = _to_int(episode_number)
+    if season is None:
+        match = _SEASON_EPISODE_RE.search(name)
+        if match:
+            season = int(match.group(1))
+            episode = int(match.group(2)) if match.group(2) else None
+    return season, episode
+
+
+def record_from_api(torrent: dict) -> TorrentRecord:
+    """Convert one GF API torrent (JSON:API resource) to a TorrentRecord."""
+    attrs = torrent.get("attributes") or {}
+    name = attrs.get("name") or "Unknown"
+    season, episode = _season_episode(name, attrs.get("season_number"), attrs.get("episode_number"))
+
+    imdb_id = attrs.get("imdb_id")
+    return TorrentRecord(
+        id=str(torrent.get("id", "")),
+        name=name,
+        created_ts=parse_timestamp(attrs.get("created_at")),
+        size=attrs.get("size") or 0,
+        seeders=attrs.get("seeders") or 0,
+        leechers=attrs.get("leechers") or 0,
+        category_id=attrs.get("category_id"),
+        info_hash=attrs.get("info_hash"),
+        freeleech=attrs.get("freeleech", "0%"),
+        imdb_id=str(imdb_id) if imdb_id else None,
+        tmdb_id=_to_int(attrs.get("tmdb_id")),
+        season=season,
+        episode=episode,
+    )
 
-        now = datetime.now(timezone.utc)
-        age_hours = (now - created_at).total_seconds() / 3600
-        return age_hours >= min_age_hours
-    except Exception as e:
-        logger.warning(f"Failed to parse date {created_at_str}: {e}")
-        return False
 
+if msgspec is not None:
+    class _GFAttributes(msgspec.Struct):
+        """The attributes the proxy reads; msgspec skips the rest of the payload (description...)."""
+
+        name: Any = None
+        created_at: Any = None
+        size: Any = None
+        seeders: Any = None
+        leechers: Any = None
+        category_id: Any = None
+        info_hash: Any = None
+        freeleech: Any = "0%"
+        imdb_id: Any = None
+        tmdb_id: Any = None
+        season_number: Any = None
+        episode_number: Any = None
+
+    class _GFTorrent(msgspec.Struct):
+        id: Any = ""
+        attributes: Optional[_GFAttributes] = None
+
+    class _GFPage(msgspec.Struct):
+        data: Optional[list[_GFTorrent]] = None
+
+    _gf_page_decoder = msgspec.json.Decoder(_GFPage)
+    _NO_ATTRIBUTES = _GFAttributes()
+
+    def _record_from_struct(torrent: "_GFTorrent") -> TorrentRecord:
+        """record_from_api for a decoded Struct (plain attribute reads, no dict lookups)."""
+        attrs = torrent.attributes or _NO_ATTRIBUTES
+        name = attrs.name or "Unknown"
+        season, episode = _season_episode(name, attrs.season_number, attrs.episode_number)
+        return TorrentRecord(
+            id=str(torrent.id),
+            name=name,
+            created_ts=parse_timestamp(attrs.created_at),
+            size=attrs.size or 0,
+            seeders=attrs.seeders or 0,
+            leechers=attrs.leechers or 0,
+            category_id=attrs.category_id,
+            info_hash=attrs.info_hash,
+            freeleech=attrs.freeleech,
+            imdb_id=str(attrs.imdb_id) if attrs.imdb_id else None,
+            tmdb_id=_to_int(attrs.tmdb_id),
+            season=season,
+            episode=episode,
+        )
+else:
+    _gf_page_decoder = None
 
-async def fetch_gf_torrents(
+
+def decode_gf_page(content: bytes) -> list[TorrentRecord]:
+    """
+    Decode an /api/torrents/filter body straight into TorrentRecords.
+
+    With msgspec, only the used fields are decoded (typed Structs, no
+    intermediate dicts); otherwise orjson or json parse the whole payload.
+    """
+    if _gf_page_decoder is not None:
+        page = _gf_page_decoder.decode(content)
+        return [_record_from_struct(torrent) for torrent in page.data or ()]
+    data = orjson.loads(content) if orjson is not None else json.loads(content)
+    return [record_from_api(torrent) for torrent in data.get("data") or ()]
+
+
+def eligibility_cutoff(min_age_hours: int = MIN_AGE_HOURS) -> float:
+    """Newest created_at epoch that is old enough right now."""
+    return time.time() - min_age_hours * 3600
+
+
+def filter_eligible(torrents: list[TorrentRecord], cutoff: float) -> list[TorrentRecord]:
+    """Keep the torrents created at or before cutoff (one clock read per batch)."""
+    return [t for t in torrents if t.created_ts is not None and t.created_ts <= cutoff]
+
+
+# === METRICS ===
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+class Histogram:
+    """Prometheus histogram (buckets, sum, count) per label set, rendered by /metrics."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = _LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list] = {}
+        metrics.append(self)
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                yield f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(key)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(key)} {cumulative}"
+
+
+metrics: list[Histogram] = []
+
+API_REQUEST_SECONDS = Histogram(
+    "gfproxy_api_request_seconds", "End-to-end /api latency, including XML streaming, by t= type"
+)
+UPSTREAM_WAIT_SECONDS = Histogram(
+    "gfproxy_upstream_wait_seconds", "Time spent waiting for an upstream scheduler token"
+)
+GF_PAGE_SECONDS = Histogram(
+    "gfproxy_gf_page_fetch_seconds", "GF /api/torrents/filter request latency by status"
+)
+SEARCH_PAGES = Histogram(
+    "gfproxy_search_pages", "GF pages fetched per search (or per deep-paging extension)",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+PAGE_ELIGIBLE_RATIO = Histogram(
+    "gfproxy_page_eligible_ratio", "Share of eligible torrents per scanned GF page",
+    buckets=(0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
+XML_RENDER_SECONDS = Histogram(
+    "gfproxy_xml_render_seconds", "Time spent rendering a Torznab XML response"
+)
+DOWNLOAD_PHASE_SECONDS = Histogram(
+    "gfproxy_download_phase_seconds", "/download timings by phase (cache, login, upstream, transfer)"
+)
+
+_API_TYPES = {"caps", "search", "tvsearch", "tv-search", "movie", "movie-search"}
+
+
+def _render_counters(prefix: str, stats: Optional[dict], counters: tuple, gauges: tuple = ()) -> Iterator[str]:
+    """Expose selected fields of a stats() dict as Prometheus counters/gauges."""
+    if stats is None:
+        return
+    for kind, names in (("counter", counters), ("gauge", gauges)):
+        for name in names:
+            metric = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+            yield f"# TYPE {metric} {kind}"
+            yield f"{metric} {stats[name]}"
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition of the histograms and the /health counters."""
+    lines = []
+    for histogram in metrics:
+        lines.extend(histogram.render())
+    lines.extend(_render_counters(
+        "gfproxy_cache", search_cache.stats(),
+        ("hits", "stale_hits", "misses", "coalesced", "refreshes", "evictions", "expirations",
+         "shared_hits", "shared_waits", "shared_errors"),
+        ("entries", "bytes"),
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_upstream", upstream.stats(),
+        ("granted", "rate_limited", "retries"),
+        ("queue_depth", "tokens", "paused_for"),
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_http", http_pool_stats(),
+        ("requests", "connections_opened"),
+        ("open_connections", "idle_connections"),
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_item_fragments", item_fragments.stats(), ("hits", "misses"), ("entries",)
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_web_sessions", web_sessions.stats(), ("logins",), ("logged_in", "active_downloads")
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_torrent_cache", torrent_cache.stats() if torrent_cache is not None else None,
+        ("hits", "misses", "evictions"), ("files", "bytes"),
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_batcher", search_batcher.stats(), ("batches", "batched_searches"), ("pending_groups",)
+    ))
+    lines.extend(_render_counters(
+        "gfproxy_horizon", eligibility_horizon.stats(), ("tracked", "released", "dropped"), ("pending",)
+    ))
+    if torrent_index is not None:
+        lines.extend(_render_counters("gfproxy_index", torrent_index.stats(), (), ("torrents",)))
+    return "\n".join(lines) + "\n"
+
+
+# === UPSTREAM SCHEDULER ===
+
+# Priority classes, lower is served first
+PRIORITY_INTERACTIVE = 0  # searches with a query or an IMDb id
+PRIORITY_RSS = 1          # empty-query polls
+PRIORITY_BACKGROUND = 2   # prefetch, index crawl, cache refresh
+
+_PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_RSS: "rss",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class UpstreamScheduler:
+    """
+    Process-wide token bucket in front of every GF request.
+
+    Callers wait in a priority queue (interactive search > RSS > background);
+    the head of the queue takes a token as soon as one is available. A 429
+    pauses the whole bucket for the Retry-After delay (or an exponential
+    backoff), so concurrent searches stop hammering GF together.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = 0
+        self._cond = asyncio.Condition()
+        self.granted = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Wait for a token, served in priority then arrival order."""
+        async with self._cond:
+            self._seq += 1
+            entry = (priority, self._seq)
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        if now < self._paused_until:
+                            timeout = self._paused_until - now
+                        elif self._tokens >= 1:
+                            heapq.heappop(self._waiters)
+                            self._tokens -= 1
+                            self.granted += 1
+                            self._cond.notify_all()
+                            return
+                        else:
+                            timeout = (1 - self._tokens) / self.rate
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def penalize(self, delay: float) -> None:
+        """Pause every caller for delay seconds after a 429."""
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0
+
+    def stats(self) -> dict:
+        depth = {name: 0 for name in _PRIORITY_NAMES.values()}
+        for priority, _ in self._waiters:
+            depth[_PRIORITY_NAMES.get(priority, str(priority))] += 1
+        self._refill(time.monotonic())
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "queue_depth": len(self._waiters),
+            "queue_depth_by_priority": depth,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            "granted": self.granted,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+upstream = UpstreamScheduler(GF_RATE_LIMIT, GF_RATE_BURST)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After header as seconds (delta-seconds or HTTP-date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+async def upstream_get(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> httpx.Response:
+    """GET through the scheduler, retrying 429s with Retry-After aware backoff."""
+    for attempt in range(GF_MAX_RETRIES + 1):
+        with UPSTREAM_WAIT_SECONDS.time(priority=_PRIORITY_NAMES.get(priority, str(priority))):
+            await upstream.acquire(priority)
+        started = time.perf_counter()
+        response = await client.get(url, params=params)
+        GF_PAGE_SECONDS.observe(time.perf_counter() - started, status=response.status_code)
+        if response.status_code != 429 or attempt == GF_MAX_RETRIES:
+            return response
+
+        delay = _retry_after(response)
+        if delay is None:
+            delay = min(GF_BACKOFF_MAX, GF_BACKOFF_BASE * 2 ** attempt) * random.uniform(1.0, 1.25)
+        logger.warning(f"Rate limited (429), pausing upstream for {delay:.1f}s (attempt {attempt + 1})")
+        upstream.penalize(delay)
+        upstream.retries += 1
+    return response
+
+
+GF_PER_PAGE = 25
+
+# Frontier page learned per RSS poll shape (see future_plans/adaptive-frontier-detection.md)
+_frontier_hints: dict[str, int] = {}
+
+
+def normalize_query(query: Optional[str]) -> Optional[str]:
+    """
+    Canonical search text, used both as cache key and as GF's name filter:
+    lowercased with whitespace collapsed. Punctuation is kept ("C++", "C#",
+    "Spider-Man" are different GF queries), so one key is one upstream query.
+    """
+    if not query:
+        return None
+    return " ".join(query.lower().split()) or None
+
+
+def normalize_imdb_id(imdb_id: Optional[str]) -> Optional[str]:
+    """IMDb id without the "tt" prefix ("tt0123456" -> "0123456")."""
+    if not imdb_id:
+        return None
+    digits = imdb_id.strip().lower().removeprefix("tt")
+    return digits or None
+
+
+def map_categories(categories: Optional[list[int]]) -> Optional[list[int]]:
+    """Torznab categories -> sorted, de-duplicated GF categories (None = no filter)."""
+    if not categories:
+        return None
+    return sorted({c for cat in categories for c in TORZNAB_TO_GF.get(cat, [])}) or None
+
+
+# Tokens GF already answered a search for (SHA-256 prefix), see token_trusted()
+_accepted_tokens: set[str] = set()
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def token_trusted(token: str) -> bool:
+    """
+    True for GF_API_TOKEN and for tokens GF has accepted at least once. Only
+    those may be served results fetched with another token (shared cache,
+    local index, RSS window, batched searches): an unknown or bogus apikey
+    goes to GF first, which rejects it as before.
+    """
+    return bool(GF_API_TOKEN) and token == GF_API_TOKEN or token_digest(token) in _accepted_tokens
+
+
+def search_cache_key(
+    token: str,
+    query: Optional[str],
+    gf_categories: Optional[list[int]],
+    imdb_id: Optional[str],
+    season: Optional[int],
+    episode: Optional[int],
+) -> str:
+    """Cache key over the normalized filters; per token unless shared with a trusted token."""
+    parts = [
+        query or "",
+        ",".join(map(str, gf_categories or ())),
+        imdb_id or "",
+        "" if season is None else str(season),
+        "" if episode is None else str(episode),
+    ]
+    if not CACHE_SHARE_ACROSS_TOKENS or not token_trusted(token):
+        parts.insert(0, token_digest(token))
+    return ":".join(parts)
+
+
+def build_gf_params(
+    token: str,
     query: Optional[str] = None,
     categories: Optional[list[int]] = None,
     imdb_id: Optional[str] = None,
     season: Optional[int] = None,
     episode: Optional[int] = None,
-    api_token: Optional[str] = None,
-    start_page: int = 1,
-) -> list[dict]:
-    """
-    Fetch torrents from GF API with pagination, filtering by age.
-    Returns only torrents >= MIN_AGE_HOURS old.
+) -> dict:
+    """Build the /api/torrents/filter query parameters (without page)."""
+    params = {
+        "api_token": token,
+        "perPage": GF_PER_PAGE,
+    }
 
-    api_token: GF API token, passed from Prowlarr apikey field or fallback to config.
-    """
-    # Use passed token or fallback to config
-    token = api_token or GF_API_TOKEN
-    if not token:
-        logger.error("No API token provided (pass via apikey or set GF_API_TOKEN in config)")
-        return []
+    if query:
+        params["name"] = query
 
-    # Build cache key (include token hash to separate caches per user)
-    token_hash = token[-8:] if token else "none"
-    cache_key = f"{token_hash}:{query}:{categories}:{imdb_id}:{season}:{episode}"
-    cached = get_cached(cache_key)
-    if cached is not None:
-        return cached
+    if imdb_id:
+        params["imdbId"] = normalize_imdb_id(imdb_id)
 
-    eligible_torrents = []
+    # Map Torznab categories to GF categories (GF API uses a categories[] array)
+    for i, cat_id in enumerate(map_categories(categories) or ()):
+        params[f"categories[{i}]"] = cat_id
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for page in range(start_page, MAX_PAGES + 1):
-            # Build API URL
-            params = {
-                "api_token": token,
-                "page": page,
-                "perPage": 25,
-            }
+    # Season/Episode filtering (for TV searches via Sonarr)
+    if season is not None:
+        params["seasonNumber"] = season
 
-            if query:
-                params["name"] = query
+    if episode is not None:
+        params["episodeNumber"] = episode
 
-            if imdb_id:
-                params["imdbId"] = imdb_id.replace("tt", "")
+    return params
 
-            # Map Torznab categories to GF categories
-            if categories:
-                gf_cats = set()
-                for cat in categories:
-                    if cat in TORZNAB_TO_GF:
-                        gf_cats.update(TORZNAB_TO_GF[cat])
-                if gf_cats:
-                    # GF API uses categories[] array
-                    for i, cat_id in enumerate(gf_cats):
-                        params[f"categories[{i}]"] = cat_id
 
-            # Season/Episode filtering (for TV searches via Sonarr)
-            if season is not None:
-                params["seasonNumber"] = season
+def query_shape(params: dict) -> Optional[str]:
+    """
+    Coarse shape of an RSS poll, used to remember where its age frontier sits.
 
-            if episode is not None:
-                params["episodeNumber"] = episode
+    None for text and IMDb searches: their frontier depends on the query itself
+    (a rare title is eligible from page 1), so a hint learned from another
+    query would only make the gallop walk back.
+    """
+    if "name" in params or "imdbId" in params:
+        return None
+    cats = sorted(v for k, v in params.items() if k.startswith("categories["))
+    return f"rss:{cats}:{'seasonNumber' in params}:{'episodeNumber' in params}"
 
-            url = f"{GF_BASE_URL}/api/torrents/filter"
-            logger.info(f"Fetching page {page}: {url} (query={query})")
 
-            try:
-                response = await client.get(url, params=params)
-
-                # Handle rate limiting (429)
-                if response.status_code == 429:
-                    logger.warning(f"Rate limited (429), waiting 5s and retrying...")
-                    await asyncio.sleep(5)
-                    response = await client.get(url, params=params)
-
-                response.raise_for_status()
-                data = response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error: {e.response.status_code}")
-                # On 429 or 5xx, return what we have so far
-                if e.response.status_code in (429, 500, 502, 503):
-                    break
+class UpstreamError(Exception):
+    """GF failed and nothing was collected: there is nothing to serve or cache."""
+
+
+async def fetch_gf_page(
+    client: httpx.AsyncClient,
+    params: dict,
+    page: int,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Optional[list[TorrentRecord]]:
+    """Fetch one page of /api/torrents/filter. Returns None on upstream error."""
+    url = f"{GF_BASE_URL}/api/torrents/filter"
+    page_params = {**params, "page": page}
+    logger.info(f"Fetching page {page}: {url} (query={params.get('name')})")
+
+    try:
+        response = await upstream_get(client, url, page_params, priority)
+        response.raise_for_status()
+        torrents = decode_gf_page(response.content)
+        _accepted_tokens.add(token_digest(params["api_token"]))
+        return torrents
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error: {e.response.status_code}")
+        return None
+    except Exception as e:
+        logger.error(f"Request failed: {e}")
+        return None
+
+
+class PageFetcher:
+    """Per-search page loader: memoizes (and de-duplicates) pages fetched during one search."""
+
+    def __init__(self, client: httpx.AsyncClient, params: dict, priority: int = PRIORITY_INTERACTIVE):
+        self.client = client
+        self.params = params
+        self.priority = priority
+        self.pages: dict[int, asyncio.Task] = {}
+        self.requests = 0
+        self.errors = 0
+
+    async def _load(self, page: int) -> Optional[list[TorrentRecord]]:
+        # Pacing against GF's rate limit is done by the upstream scheduler
+        self.requests += 1
+        torrents = await fetch_gf_page(self.client, self.params, page, self.priority)
+        if torrents is None:
+            self.errors += 1
+        # Opportunistically feed the local index with every page seen
+        if torrent_index is not None and torrents:
+            await asyncio.to_thread(torrent_index.upsert, torrents)
+        return torrents
+
+    def start(self, page: int) -> asyncio.Task:
+        """Start fetching a page in the background (no-op if already started)."""
+        task = self.pages.get(page)
+        if task is None or task.cancelled():
+            self.pages[page] = asyncio.create_task(self._load(page))
+        return self.pages[page]
+
+    async def get(self, page: int) -> Optional[list[TorrentRecord]]:
+        return await self.start(page)
+
+    def cancel_pending(self) -> None:
+        """Cancel page fetches that are no longer needed, so a later scan starts them again."""
+        for page, task in list(self.pages.items()):
+            if not task.done():
+                task.cancel()
+                del self.pages[page]
+
+    def contiguous(self, first_page: int = 1) -> list[TorrentRecord]:
+        """Torrents of the successfully fetched pages first_page, first_page + 1... up to the first gap."""
+        torrents = []
+        page = first_page
+        while True:
+            task = self.pages.get(page)
+            if task is None or not task.done() or task.cancelled() or task.exception() is not None:
                 break
-            except Exception as e:
-                logger.error(f"Request failed: {e}")
+            result = task.result()
+            if not result:
                 break
+            torrents.extend(result)
+            page += 1
+        return torrents
+
+    def fetched(self) -> Iterator[TorrentRecord]:
+        """Every torrent of the pages that were fetched successfully."""
+        for task in self.pages.values():
+            if task.done() and not task.cancelled() and task.exception() is None and task.result():
+                yield from task.result()
+
+
+async def collect_eligible(
+    fetcher: PageFetcher,
+    first_page: int,
+    want: int = RESULTS_LIMIT,
+    last_page: int = MAX_PAGES,
+    satisfied: Optional[Callable[[list[TorrentRecord]], bool]] = None,
+) -> tuple[list[TorrentRecord], Optional[int]]:
+    """
+    Scan forward from first_page until `want` eligible torrents are collected
+    (or until satisfied(collected) holds, when given).
 
-            torrents = data.get("data", [])
+    Whole pages are kept, so the result may exceed `want`. Returns the torrents
+    and the next page to scan (None once GF has no more results).
+
+    With SEARCH_FANOUT > 1, the next pages are requested concurrently (still
+    paced by the upstream scheduler) and consumed in page order; pages still
+    in flight are cancelled once enough results are collected.
+    """
+    eligible_torrents = []
+    window = max(1, min(SEARCH_FANOUT, upstream.burst))
+    next_page: Optional[int] = last_page + 1
+
+    try:
+        for page in range(first_page, last_page + 1):
+            for ahead in range(page, min(page + window, last_page + 1)):
+                fetcher.start(ahead)
+
+            torrents = await fetcher.get(page)
+            if torrents is None:
+                # Upstream error: return what we have so far, resume here next time
+                next_page = page
+                break
             if not torrents:
                 logger.info(f"No more torrents on page {page}")
+                next_page = None
                 break
 
-            # Filter by age
-            for torrent in torrents:
-                if is_torrent_eligible(torrent):
-                    eligible_torrents.append(torrent)
+            # Filter by age, against one cutoff per page
+            eligible = filter_eligible(torrents, eligibility_cutoff())
+            PAGE_ELIGIBLE_RATIO.observe(len(eligible) / len(torrents))
+            eligible_torrents.extend(eligible)
 
-                    # Stop if we have enough
-                    if len(eligible_torrents) >= RESULTS_LIMIT:
-                        logger.info(f"Reached limit of {RESULTS_LIMIT} results")
-                        set_cache(cache_key, eligible_torrents)
-                        return eligible_torrents
+            # Stop if we have enough
+            if satisfied(eligible_torrents) if satisfied is not None else len(eligible_torrents) >= want:
+                logger.info(f"Reached {want} results on page {page}")
+                next_page = page + 1
+                break
 
             logger.info(
                 f"Page {page}: {len(torrents)} torrents, "
                 f"{len(eligible_torrents)} eligible so far"
             )
+    finally:
+        fetcher.cancel_pending()
 
-            # Respectful delay between pages (1s to avoid GF rate limiting)
-            if page < MAX_PAGES:
-                await asyncio.sleep(1.0)
+    if next_page is not None and next_page > DEEP_PAGING_MAX_PAGES:
+        next_page = None
+    return eligible_torrents, next_page
 
-    set_cache(cache_key, eligible_torrents)
-    return eligible_torrents
 
+class ResultSet:
+    """
+    Eligible torrents found so far for one search, plus the upstream page the
+    scan stopped at. Paging past the collected items (Torznab offset) extends
+    the set in place from that page instead of re-scanning from page 1.
+    """
+
+    def __init__(
+        self,
+        items: list[TorrentRecord],
+        params: Optional[dict] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        next_page: Optional[int] = None,
+    ):
+        self.items = items
+        # Kept without the API token: result sets are shared between callers (and workers)
+        self.params = {k: v for k, v in params.items() if k != "api_token"} if params else params
+        self.priority = priority
+        self.next_page = next_page
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.next_page is None
+
+    async def ensure(self, count: int, token: str) -> list[TorrentRecord]:
+        """Make sure at least `count` items are collected, if GF has them."""
+        if len(self.items) < count and not self.exhausted:
+            async with self._lock:
+                if len(self.items) < count and not self.exhausted:
+                    await self._extend(count, token)
+        return self.items
+
+    async def _extend(self, count: int, token: str) -> None:
+        fetcher = PageFetcher(get_http_client(), {**self.params, "api_token": token}, self.priority)
+        while len(self.items) < count and self.next_page is not None:
+            more, self.next_page = await collect_eligible(
+                fetcher, self.next_page, count - len(self.items), DEEP_PAGING_MAX_PAGES
+            )
+            if not more:
+                break
+            # Pages shift as GF gets new uploads: drop what the previous pages already had
+            known = {t.id for t in self.items}
+            fresh = []
+            for t in more:
+                if t.id not in known:
+                    known.add(t.id)
+                    fresh.append(t)
+            self.items = self.items + fresh
+        SEARCH_PAGES.observe(fetcher.requests)
+        logger.info(
+            f"Extended result set to {len(self.items)} torrents "
+            f"in {fetcher.requests} upstream requests"
+        )
+
+    def admit(self, torrents: list[TorrentRecord]) -> None:
+        """Add torrents that just became eligible; they are the newest eligible ones."""
+        known = {t.id for t in self.items}
+        fresh = sorted((t for t in torrents if t.id not in known), key=lambda t: t.created_ts, reverse=True)
+        if fresh:
+            # New list rather than in-place insert: responses being streamed keep their snapshot
+            self.items = fresh + self.items
+
+    def to_dict(self) -> dict:
+        return {"items": self.items, "params": self.params, "priority": self.priority, "next_page": self.next_page}
+
+
+class EligibilityHorizon:
+    """
+    Min-heap of torrents seen while still too young, keyed by the moment they
+    become eligible (created_at + MIN_AGE_HOURS).
+
+    release() hands the ones whose moment came to the cached result set of the
+    search (cache key) whose scan saw them, so cached searches and RSS polls
+    pick up newly eligible torrents without waiting for a TTL expiry and a
+    refetch. Entries are de-duplicated per (cache key, torrent id): a refresh
+    re-tracks the same torrents for the new result set instead of piling up.
+    Result sets are held through weak references; when the heap is full,
+    entries whose result set is gone are purged before a new one is dropped.
+    """
+
+    def __init__(self, max_entries: int = HORIZON_MAX_ENTRIES, min_age_hours: int = MIN_AGE_HOURS):
+        self.max_entries = max_entries
+        self.min_age = min_age_hours * 3600
+        self._heap: list[tuple[float, str, str]] = []
+        # (cache key, torrent id) -> latest record seen
+        self._pending: dict[tuple[str, str], TorrentRecord] = {}
+        # cache key -> newest result set built for it
+        self._targets: dict[str, weakref.ref] = {}
+        self.tracked = 0
+        self.released = 0
+        self.dropped = 0
+
+    def track(self, key: str, results: ResultSet, torrents: Iterator[TorrentRecord]) -> None:
+        """Remember the not-yet-eligible torrents a scan for `results` (cached under key) came across."""
+        cutoff = eligibility_cutoff()
+        young = [t for t in torrents if t.created_ts is not None and t.created_ts > cutoff]
+        if young or key in self._targets:
+            self._targets[key] = weakref.ref(results)
+        for torrent in young:
+            entry = (key, torrent.id)
+            if entry in self._pending:
+                self._pending[entry] = torrent
+                continue
+            if len(self._pending) >= self.max_entries and not self._purge():
+                self.dropped += 1
+                continue
+            self._pending[entry] = torrent
+            heapq.heappush(self._heap, (torrent.created_ts + self.min_age, key, torrent.id))
+            self.tracked += 1
+
+    def _purge(self) -> bool:
+        """Forget the entries of result sets that were evicted; True if room was made."""
+        dead = {key for key, ref in self._targets.items() if ref() is None}
+        if not dead:
+            return False
+        for key in dead:
+            del self._targets[key]
+        self._pending = {entry: t for entry, t in self._pending.items() if entry[0] not in dead}
+        self._heap = [item for item in self._heap if item[1] not in dead]
+        heapq.heapify(self._heap)
+        return len(self._pending) < self.max_entries
+
+    def release(self) -> int:
+        """Move every torrent that became eligible into its result set."""
+        now = time.time()
+        if not self._heap or self._heap[0][0] > now:
+            return 0
+        ready: dict[str, list[TorrentRecord]] = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, key, torrent_id = heapq.heappop(self._heap)
+            torrent = self._pending.pop((key, torrent_id), None)
+            if torrent is not None:
+                ready.setdefault(key, []).append(torrent)
+        released = 0
+        for key, torrents in ready.items():
+            ref = self._targets.get(key)
+            results = ref() if ref is not None else None
+            if results is None:
+                self._targets.pop(key, None)
+                continue
+            results.admit(torrents)
+            released += len(torrents)
+        self.released += released
+        return released
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "next_in": round(max(0.0, self._heap[0][0] - time.time()), 1) if self._heap else None,
+            "tracked": self.tracked,
+            "released": self.released,
+            "dropped": self.dropped,
+        }
+
+
+eligibility_horizon = EligibilityHorizon()
+
+
+async def scan_linear(
+    fetcher: PageFetcher, shape: Optional[str], start_page: int
+) -> tuple[list[TorrentRecord], Optional[int]]:
+    """Walk pages start_page..MAX_PAGES one by one."""
+    return await collect_eligible(fetcher, start_page)
+
+
+async def scan_frontier(
+    fetcher: PageFetcher, shape: Optional[str], start_page: int
+) -> tuple[list[TorrentRecord], Optional[int]]:
+    """
+    Galloping + binary search for the age frontier, then scan forward.
 
-def build_torznab_xml(torrents: list[dict], query_type: str = "search", api_token: Optional[str] = None) -> str:
-    """Build Torznab-compatible XML response using string templates."""
+    GF returns torrents newest first, so "page holds an eligible torrent (or is
+    past the end)" is monotonic in the page number. Starting from the frontier
+    remembered for this RSS shape (start_page for searches), gallop (1, 2, 4...)
+    towards the boundary, binary-search the bracket, then collect from the
+    first crossing page.
+    """
+
+    async def crosses(page: int) -> Optional[bool]:
+        torrents = await fetcher.get(page)
+        if torrents is None:
+            return None
+        return not torrents or bool(filter_eligible(torrents, eligibility_cutoff()))
+
+    lo = start_page - 1  # last page known to hold only too-young torrents
+    hint = _frontier_hints.get(shape, start_page) if shape else start_page
+    probe = min(max(start_page, hint), MAX_PAGES)
+
+    result = await crosses(probe)
+    if result is None:
+        return [], lo + 1  # Upstream error: resume after the last all-young page
+
+    if result:
+        # Gallop backward to make sure no earlier page already crosses
+        hi = probe
+        step = 1
+        while hi > lo + 1:
+            page = max(hi - step, lo + 1)
+            result = await crosses(page)
+            if result is None:
+                return [], lo + 1  # Upstream error: resume after the last all-young page
+            if result:
+                hi = page
+                step *= 2
+            else:
+                lo = page
+                break
+    else:
+        # Gallop forward until a page crosses the boundary
+        lo = probe
+        step = 1
+        while True:
+            if lo >= MAX_PAGES:
+                logger.info(f"No eligible torrent within {MAX_PAGES} pages ({fetcher.requests} requests)")
+                return [], MAX_PAGES + 1
+            page = min(lo + step, MAX_PAGES)
+            result = await crosses(page)
+            if result is None:
+                return [], lo + 1  # Upstream error: resume after the last all-young page
+            if result:
+                hi = page
+                break
+            lo = page
+            step *= 2
+
+    # Binary search: lo is all-young, hi crosses
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        result = await crosses(mid)
+        if result is None:
+            return [], lo + 1  # Upstream error: resume after the last all-young page
+        if result:
+            hi = mid
+        else:
+            lo = mid
+
+    logger.info(f"Frontier for {shape or 'search'} at page {hi} ({fetcher.requests} requests)")
+    if shape:
+        _frontier_hints[shape] = hi
+    return await collect_eligible(fetcher, hi)
+
+
+SEARCH_STRATEGIES = {
+    "linear": scan_linear,
+    "frontier": scan_frontier,
+}
+
+
+class RssWindow:
+    """
+    Rolling window of the newest GF torrents for one RSS poll shape (category filter).
+
+    The window holds every torrent from the top of the GF listing down to
+    RESULTS_LIMIT eligible ones, young ones included. A poll only reads pages
+    until it reaches a torrent it already knows (id not above the highest id
+    seen, or created_at not above the newest one when ids are not numeric),
+    merges the new ones on top and serves the eligible part: usually a single
+    upstream page. A full rescan runs on the first poll, every
+    RSS_RESYNC_SECONDS (to drop torrents deleted on GF) and when more than
+    RSS_DELTA_MAX_PAGES pages are new.
+    """
+
+    def __init__(self, params: dict):
+        self.params = {k: v for k, v in params.items() if k != "api_token"}
+        self.torrents: list[TorrentRecord] = []
+        self.top_id: Optional[int] = None
+        self.top_created = 0.0
+        self.exhausted = False
+        self.synced_at = 0.0
+        self.polls = 0
+        self.resyncs = 0
+        self.delta_pages = 0
+        self._lock = asyncio.Lock()
+
+    def _is_new(self, torrent: TorrentRecord) -> bool:
+        torrent_id = _to_int(torrent.id)
+        if torrent_id is not None and self.top_id is not None:
+            return torrent_id > self.top_id
+        return torrent.created_ts is not None and torrent.created_ts > self.top_created
+
+    def _mark_top(self, torrents: list[TorrentRecord]) -> None:
+        ids = [i for i in (_to_int(t.id) for t in torrents) if i is not None]
+        if ids:
+            self.top_id = max(ids + ([self.top_id] if self.top_id is not None else []))
+        created = [t.created_ts for t in torrents if t.created_ts is not None]
+        if created:
+            self.top_created = max(created + [self.top_created])
+
+    async def _resync(self, fetcher: PageFetcher) -> None:
+        _, next_page = await collect_eligible(fetcher, 1)
+        torrents = fetcher.contiguous()
+        if not torrents and next_page is not None:
+            return  # Upstream error: keep the previous window
+        self.torrents = torrents
+        self.exhausted = next_page is None
+        self.top_id, self.top_created = None, 0.0
+        self._mark_top(torrents)
+        self.synced_at = time.monotonic()
+        self.resyncs += 1
+
+    async def _delta(self, fetcher: PageFetcher) -> bool:
+        """Merge the torrents uploaded since the last poll; False if a full resync is needed."""
+        new = []
+        for page in range(1, RSS_DELTA_MAX_PAGES + 1):
+            torrents = await fetcher.get(page)
+            if torrents is None:
+                return True  # Upstream error: serve the current window
+            self.delta_pages += 1
+            fresh = [t for t in torrents if self._is_new(t)]
+            new.extend(fresh)
+            if len(fresh) < len(torrents) or len(torrents) < GF_PER_PAGE:
+                break
+        else:
+            return False
+
+        if new:
+            known = {t.id for t in new}
+            self.torrents = new + [t for t in self.torrents if t.id not in known]
+            self._mark_top(new)
+        return True
+
+    async def poll(self, token: str, cache_key: str) -> ResultSet:
+        async with self._lock:
+            self.polls += 1
+            fetcher = PageFetcher(get_http_client(), {**self.params, "api_token": token}, PRIORITY_RSS)
+            stale = time.monotonic() - self.synced_at > RSS_RESYNC_SECONDS
+            if not self.torrents or stale or not await self._delta(fetcher):
+                await self._resync(fetcher)
+            SEARCH_PAGES.observe(fetcher.requests)
+            if not self.torrents and fetcher.errors:
+                raise UpstreamError("RSS sync failed")
+
+            cutoff = eligibility_cutoff()
+            young = [t for t in self.torrents if t.created_ts is None or t.created_ts > cutoff]
+            eligible = filter_eligible(self.torrents, cutoff)[:RESULTS_LIMIT]
+            # Keep the window contiguous from the top of the listing
+            self.torrents = self.torrents[:len(young) + len(eligible)]
+            next_page = None if self.exhausted else len(self.torrents) // GF_PER_PAGE + 1
+            logger.info(
+                f"RSS delta poll: {fetcher.requests} upstream requests, "
+                f"{len(young)} young + {len(eligible)} eligible in window"
+            )
+
+        results = ResultSet(eligible, self.params, PRIORITY_RSS, next_page)
+        if HORIZON_MAX_ENTRIES > 0:
+            eligibility_horizon.track(cache_key, results, young)
+        return results
+
+    def to_dict(self) -> dict:
+        return {
+            "params": self.params,
+            "torrents": self.torrents,
+            "top_id": self.top_id,
+            "top_created": self.top_created,
+            "exhausted": self.exhausted,
+            # Wall clock, so the resync schedule survives a restart
+            "synced_at": time.time() - (time.monotonic() - self.synced_at),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RssWindow":
+        window = cls(data["params"])
+        window.torrents = [TorrentRecord(**t) for t in data["torrents"]]
+        window.top_id = data["top_id"]
+        window.top_created = data["top_created"]
+        window.exhausted = data["exhausted"]
+        window.synced_at = time.monotonic() - (time.time() - data["synced_at"])
+        return window
+
+    def stats(self) -> dict:
+        return {
+            "torrents": len(self.torrents),
+            "top_id": self.top_id,
+            "polls": self.polls,
+            "resyncs": self.resyncs,
+            "delta_pages": self.delta_pages,
+        }
+
+
+# RSS windows by category filter
+_rss_windows: dict[str, RssWindow] = {}
+
+
+class _BatchMember:
+    __slots__ = ("episode", "params", "cache_key", "search", "future")
+
+    def __init__(self, episode, params, cache_key, search):
+        self.episode = episode
+        self.params = params
+        self.cache_key = cache_key
+        self.search = search
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def matches(self, torrent: TorrentRecord) -> bool:
+        # IMDb id, categories and season are filtered upstream by the batched query
+        return self.episode is None or torrent.episode == self.episode
+
+
+class SearchBatcher:
+    """
+    Groups concurrent searches for the same IMDb id, categories and season
+    (Sonarr searching the missing episodes of a season) arriving within
+    BATCH_WINDOW_MS.
+
+    The first search of a group waits for the window, then one upstream query
+    for the season runs, keeping the episode only when all members agree. Its
+    results are filtered back per member by episode. A member left short of
+    RESULTS_LIMIT because the scan stopped at MAX_PAGES runs its own query. A
+    group of one runs its own search unchanged.
+    """
+
+    def __init__(self, window_ms: int = BATCH_WINDOW_MS):
+        self.window = window_ms / 1000
+        self._groups: dict[str, list[_BatchMember]] = {}
+        self.batches = 0
+        self.batched_searches = 0
+
+    async def submit(
+        self,
+        token: str,
+        imdb_id: str,
+        gf_categories: Optional[list[int]],
+        season: Optional[int],
+        episode: Optional[int],
+        params: dict,
+        cache_key: str,
+        search: Callable[[], Awaitable[ResultSet]],
+    ) -> ResultSet:
+        member = _BatchMember(episode, params, cache_key, search)
+        # Mixing categories or seasons would widen the upstream query more than it
+        # saves, and push older seasons past MAX_PAGES
+        key = f"{imdb_id}:{','.join(map(str, gf_categories or ()))}:{'' if season is None else season}"
+        group = self._groups.get(key)
+        if group is not None:
+            group.append(member)
+            return await member.future
+
+        self._groups[key] = members = [member]
+        try:
+            await asyncio.sleep(self.window)
+            del self._groups[key]
+            if len(members) == 1:
+                member.future.set_result(await member.search())
+            else:
+                await self._run(token, imdb_id, gf_categories, season, members)
+        except BaseException as e:
+            if self._groups.get(key) is members:
+                del self._groups[key]
+            for m in members:
+                if not m.future.done():
+                    if isinstance(e, Exception):
+                        m.future.set_exception(e)
+                    else:
+                        m.future.cancel()
+            if not isinstance(e, Exception):
+                raise
+        return await member.future
+
+    async def _run(
+        self,
+        token: str,
+        imdb_id: str,
+        gf_categories: Optional[list[int]],
+        season: Optional[int],
+        members: list[_BatchMember],
+    ) -> None:
+        episodes = {m.episode for m in members}
+        params = build_gf_params(
+            token,
+            imdb_id=imdb_id,
+            season=season,
+            episode=episodes.pop() if len(episodes) == 1 else None,
+        )
+        for i, cat_id in enumerate(gf_categories or ()):
+            params[f"categories[{i}]"] = cat_id
+
+        def satisfied(torrents: list[TorrentRecord]) -> bool:
+            return all(sum(1 for t in torrents if m.matches(t)) >= RESULTS_LIMIT for m in members)
+
+        fetcher = PageFetcher(get_http_client(), params, PRIORITY_INTERACTIVE)
+        torrents, next_page = await collect_eligible(fetcher, 1, satisfied=satisfied)
+        SEARCH_PAGES.observe(fetcher.requests)
+        if not torrents and fetcher.errors:
+            raise UpstreamError(f"Batched search for imdb {imdb_id} failed")
+        self.batches += 1
+        self.batched_searches += len(members)
+        logger.info(
+            f"Batched {len(members)} searches for imdb {imdb_id} into "
+            f"{fetcher.requests} upstream requests ({len(torrents)} eligible torrents)"
+        )
+
+        seen = list(fetcher.fetched())
+        short = []
+        for m in members:
+            items = [t for t in torrents if m.matches(t)]
+            if next_page is not None and len(items) < RESULTS_LIMIT:
+                # The scan stopped at MAX_PAGES before this member was served in full
+                short.append(m)
+                continue
+            # Deep paging past the batch runs the member's own query (duplicates are skipped)
+            results = ResultSet(items, m.params, PRIORITY_INTERACTIVE, None if next_page is None else 1)
+            if HORIZON_MAX_ENTRIES > 0:
+                eligibility_horizon.track(m.cache_key, results, (t for t in seen if m.matches(t)))
+            m.future.set_result(results)
+
+        if short:
+            logger.info(f"{len(short)} batched searches for imdb {imdb_id} fell short, running them alone")
+            outcomes = await asyncio.gather(*(m.search() for m in short), return_exceptions=True)
+            for m, outcome in zip(short, outcomes):
+                if isinstance(outcome, asyncio.CancelledError):
+                    m.future.cancel()
+                elif isinstance(outcome, BaseException):
+                    m.future.set_exception(outcome)
+                else:
+                    m.future.set_result(outcome)
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": int(self.window * 1000),
+            "pending_groups": len(self._groups),
+            "batches": self.batches,
+            "batched_searches": self.batched_searches,
+        }
+
+
+search_batcher = SearchBatcher()
+
+
+async def fetch_gf_torrents(
+    query: Optional[str] = None,
+    categories: Optional[list[int]] = None,
+    imdb_id: Optional[str] = None,
+    season: Optional[int] = None,
+    episode: Optional[int] = None,
+    api_token: Optional[str] = None,
+    start_page: int = 1,
+) -> ResultSet:
+    """
+    Fetch torrents from GF API with pagination, filtering by age.
+    Returns only torrents >= MIN_AGE_HOURS old, as a lazily extendable ResultSet.
+
+    api_token: GF API token, passed from Prowlarr apikey field or fallback to config.
+    """
     # Use passed token or fallback to config
     token = api_token or GF_API_TOKEN
+    if not token:
+        logger.error("No API token provided (pass via apikey or set GF_API_TOKEN in config)")
+        return ResultSet([])
+
+    # "Batman", "batman " and "BATMAN" share one cache entry and one upstream query
+    query = normalize_query(query)
+    imdb_id = normalize_imdb_id(imdb_id)
+
+    # Results fetched with other tokens are only served to tokens GF accepted
+    trusted = token_trusted(token)
+    if trusted:
+        indexed = await search_index(query, categories, imdb_id, season, episode)
+        if indexed is not None:
+            return indexed
+
+    cache_key = search_cache_key(token, query, map_categories(categories), imdb_id, season, episode)
+    # Bring cached result sets up to date with torrents that aged in since their scan
+    eligibility_horizon.release()
+
+    params = build_gf_params(token, query, categories, imdb_id, season, episode)
+
+    async def search() -> ResultSet:
+        # Empty-query polls are RSS syncs; anything else is a user/interactive search
+        priority = PRIORITY_INTERACTIVE if (query or imdb_id) else PRIORITY_RSS
+        fetcher = PageFetcher(get_http_client(), params, priority)
+        strategy = SEARCH_STRATEGIES.get(SEARCH_STRATEGY, scan_frontier)
+
+        eligible_torrents, next_page = await strategy(fetcher, query_shape(params), start_page)
+        SEARCH_PAGES.observe(fetcher.requests)
+        # Raising keeps a failed scan out of the cache (and a stale entry in it)
+        if not eligible_torrents and fetcher.errors:
+            raise UpstreamError(f"Search failed after {fetcher.requests} upstream requests")
+        logger.info(
+            f"{len(eligible_torrents)} eligible torrents in {fetcher.requests} "
+            f"upstream requests ({SEARCH_STRATEGY})"
+        )
+        results = ResultSet(eligible_torrents, params, priority, next_page)
+        if HORIZON_MAX_ENTRIES > 0:
+            eligibility_horizon.track(cache_key, results, fetcher.fetched())
+        return results
+
+    async def fetch() -> ResultSet:
+        if RSS_DELTA_ENABLED and trusted and not query and not imdb_id and season is None and episode is None:
+            shape = ",".join(map(str, map_categories(categories) or ()))
+            window = _rss_windows.get(shape)
+            if window is None:
+                window = _rss_windows[shape] = RssWindow(params)
+            return await window.poll(token, cache_key)
+        if BATCH_WINDOW_MS > 0 and trusted and imdb_id and not query:
+            return await search_batcher.submit(
+                token, imdb_id, map_categories(categories), season, episode, params, cache_key, search
+            )
+        return await search()
 
-    items_xml = []
+    # Concurrent identical searches share one upstream fetch
+    return await search_cache.get_or_fetch(cache_key, fetch)
 
-    for torrent in torrents:
-        attrs = torrent.get("attributes", {})
-        torrent_id = torrent.get("id", "")
 
-        # Download link with token
-        download_link = f'http://gf-free-proxy:{LISTEN_PORT}/download?id={torrent_id}'
+# === LOCAL INDEX ===
 
-        # Publication date (RFC 822 format)
-        pub_date = ""
-        created_at = attrs.get("created_at", "")
-        if created_at:
-            try:
-                dt = date_parser.parse(created_at)
-                pub_date = dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
-            except Exception:
-                pass
+def _record_from_row(data: str) -> TorrentRecord:
+    """Decode the data column (older rows hold the raw GF JSON)."""
+    fields = json.loads(data)
+    if "attributes" in fields:
+        return record_from_api(fields)
+    return TorrentRecord(**fields)
+
+
+class TorrentIndex:
+    """
+    Local SQLite (FTS5) index of GF torrents, filled by the background crawler.
+
+    Searches are answered with an indexed range query on created_at, so the age
+    filter costs nothing. The index only answers a search on its own once the
+    backfill reached the end of the GF catalogue, or when it already holds
+    enough results; otherwise the caller falls back to the live API.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS torrents (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                category_id INTEGER,
+                imdb_id INTEGER,
+                tmdb_id INTEGER,
+                season INTEGER,
+                episode INTEGER,
+                size INTEGER,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_torrents_created ON torrents(created_at);
+            CREATE INDEX IF NOT EXISTS idx_torrents_imdb ON torrents(imdb_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_torrents_tmdb ON torrents(tmdb_id, created_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS torrents_fts USING fts5(
+                name, content='torrents', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS torrents_ai AFTER INSERT ON torrents BEGIN
+                INSERT INTO torrents_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS torrents_ad AFTER DELETE ON torrents BEGIN
+                INSERT INTO torrents_fts(torrents_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS torrents_au AFTER UPDATE OF name ON torrents BEGIN
+                INSERT INTO torrents_fts(torrents_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO torrents_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._db.commit()
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO meta(key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value)),
+            )
+            self._db.commit()
+
+    @property
+    def ready(self) -> bool:
+        """True once the head of the catalogue has been crawled at least once."""
+        return self.get_meta("head_crawled_at") is not None
+
+    @property
+    def complete(self) -> bool:
+        """True once the backfill reached the last GF page."""
+        return self.get_meta("backfill_done") == "1"
+
+    def upsert(self, torrents: list[TorrentRecord]) -> int:
+        """Insert or refresh torrents. Returns how many ids were new."""
+        rows = []
+        for torrent in torrents:
+            torrent_id = _to_int(torrent.id)
+            if torrent_id is None or torrent.created_ts is None:
+                continue
+            rows.append((
+                torrent_id, torrent.name, torrent.created_ts, torrent.category_id,
+                _to_int(torrent.imdb_id), torrent.tmdb_id, torrent.season, torrent.episode,
+                torrent.size, json.dumps(torrent.to_dict()),
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            known = {
+                row[0] for row in self._db.execute(
+                    f"SELECT id FROM torrents WHERE id IN ({','.join('?' * len(rows))})",
+                    [row[0] for row in rows],
+                )
+            }
+            self._db.executemany(
+                "INSERT INTO torrents(id, name, created_at, category_id, imdb_id, tmdb_id, "
+                "season, episode, size, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name = excluded.name, data = excluded.data, "
+                "category_id = excluded.category_id, size = excluded.size",
+                rows,
+            )
+            self._db.commit()
+        return len(rows) - len(known)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        gf_categories: Optional[list[int]] = None,
+        imdb_id: Optional[str] = None,
+        season: Optional[int] = None,
+        episode: Optional[int] = None,
+        limit: int = RESULTS_LIMIT,
+    ) -> list[TorrentRecord]:
+        """Eligible torrents matching the filters, newest first."""
+        cutoff = eligibility_cutoff()
+        where = ["created_at <= ?"]
+        args: list = [cutoff]
+
+        if query:
+            words = re.findall(r"\w+", query)
+            if words:
+                # Prefix match per word, close to GF's substring "name" filter
+                match = " AND ".join(f'"{w}"*' for w in words)
+                where.append("id IN (SELECT rowid FROM torrents_fts WHERE torrents_fts MATCH ?)")
+                args.append(match)
+        if gf_categories:
+            where.append(f"category_id IN ({','.join('?' * len(gf_categories))})")
+            args.extend(gf_categories)
+        if imdb_id:
+            where.append("imdb_id = ?")
+            args.append(_to_int(imdb_id))
+        if season is not None:
+            where.append("season = ?")
+            args.append(season)
+        if episode is not None:
+            where.append("episode = ?")
+            args.append(episode)
+
+        sql = (
+            f"SELECT data FROM torrents WHERE {' AND '.join(where)} "
+            f"ORDER BY created_at DESC LIMIT ?"
+        )
+        args.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [_record_from_row(row[0]) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM torrents").fetchone()[0]
+        return {
+            "torrents": count,
+            "ready": self.ready,
+            "complete": self.complete,
+            "backfill_page": int(self.get_meta("backfill_page", "1")),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class IndexResultSet(ResultSet):
+    """Result set served from the local index; deep paging re-queries it with a larger limit."""
+
+    def __init__(self, items: list[TorrentRecord], search_args: tuple, limit: int):
+        super().__init__(items, next_page=None if len(items) < limit else 0)
+        self.search_args = search_args
+
+    async def _extend(self, count: int, token: str) -> None:
+        self.items = await asyncio.to_thread(torrent_index.search, *self.search_args, count)
+        if len(self.items) < count:
+            self.next_page = None
+
+
+torrent_index: Optional[TorrentIndex] = None
+
+async def crawl_index_once(index: TorrentIndex, token: str) -> None:
+    """One crawler cycle: refresh the head of the catalogue, then backfill older pages."""
+    client = get_http_client()
+    params = build_gf_params(token)
+
+    # Head: newest pages until a page brings nothing new
+    new_total = 0
+    for page in range(1, INDEX_CRAWL_PAGES + 1):
+        torrents = await fetch_gf_page(client, params, page, PRIORITY_BACKGROUND)
+        if not torrents:
+            break
+        new = await asyncio.to_thread(index.upsert, torrents)
+        new_total += new
+        if new == 0:
+            break
+    index.set_meta("head_crawled_at", datetime.now(timezone.utc).isoformat())
+
+    if index.complete:
+        return
+
+    # Backfill: resume deeper pages, shifted by the pages pushed down since last cycle
+    backfill_page = int(index.get_meta("backfill_page", "1"))
+    backfill_page = max(1, backfill_page + new_total // GF_PER_PAGE)
+    for _ in range(INDEX_BACKFILL_PAGES):
+        torrents = await fetch_gf_page(client, params, backfill_page, PRIORITY_BACKGROUND)
+        if torrents is None:
+            break
+        if not torrents:
+            index.set_meta("backfill_done", "1")
+            logger.info(f"Index backfill complete at page {backfill_page}")
+            break
+        await asyncio.to_thread(index.upsert, torrents)
+        backfill_page += 1
+    index.set_meta("backfill_page", backfill_page)
+
+
+async def run_index_crawler(index: TorrentIndex) -> None:
+    """Background task: crawl GF into the local index every INDEX_CRAWL_INTERVAL seconds."""
+    while True:
+        try:
+            await crawl_index_once(index, GF_API_TOKEN)
+            logger.info(f"Index crawl done: {index.stats()}")
+        except Exception as e:
+            logger.error(f"Index crawl failed: {e}")
+        await asyncio.sleep(INDEX_CRAWL_INTERVAL)
+
+
+async def search_index(
+    query: Optional[str],
+    categories: Optional[list[int]],
+    imdb_id: Optional[str],
+    season: Optional[int],
+    episode: Optional[int],
+) -> Optional[ResultSet]:
+    """Answer a search from the local index, or None if the live API is needed."""
+    if torrent_index is None or not torrent_index.ready:
+        return None
+
+    gf_cats = map_categories(categories)
+    search_args = (query, gf_cats, imdb_id, season, episode)
+    torrents = await asyncio.to_thread(torrent_index.search, *search_args, RESULTS_LIMIT)
+    if len(torrents) >= RESULTS_LIMIT or torrent_index.complete:
+        logger.info(f"Served {len(torrents)} torrents from local index")
+        return IndexResultSet(torrents, search_args, RESULTS_LIMIT)
+    return None
 
-        size = attrs.get("size", 0)
-        seeders = attrs.get("seeders", 0)
-        leechers = attrs.get("leechers", 0)
 
-        # Torznab attributes
-        torznab_attrs = []
+def render_torznab_item(torrent: TorrentRecord) -> str:
+    """Render one Torznab <item> for a GF torrent."""
+    torrent_id = torrent.id
 
-        # Category
-        category_id = attrs.get("category_id")
-        if category_id and category_id in CATEGORY_MAP:
-            for torznab_cat in CATEGORY_MAP[category_id]:
-                torznab_attrs.append(f'<torznab:attr name="category" value="{torznab_cat}"/>')
+    # Download link with token
+    download_link = f'http://gf-free-proxy:{LISTEN_PORT}/download?id={torrent_id}'
 
-        torznab_attrs.append(f'<torznab:attr name="seeders" value="{seeders}"/>')
-        torznab_attrs.append(f'<torznab:attr name="peers" value="{seeders + leechers}"/>')
+    # Publication date (RFC 822 format), from the epoch computed at ingest
+    pub_date = ""
+    if torrent.created_ts is not None:
+        pub_date = time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime(torrent.created_ts))
 
-        info_hash = attrs.get("info_hash")
-        if info_hash:
-            torznab_attrs.append(f'<torznab:attr name="infohash" value="{info_hash}"/>')
+    size = torrent.size
+    seeders = torrent.seeders
+    leechers = torrent.leechers
 
-        # Freeleech
-        freeleech = attrs.get("freeleech", "0%")
-        dl_factor = 0 if freeleech and freeleech != "0%" else 1
-        torznab_attrs.append(f'<torznab:attr name="downloadvolumefactor" value="{dl_factor}"/>')
-        torznab_attrs.append('<torznab:attr name="uploadvolumefactor" value="1"/>')
+    # Torznab attributes
+    torznab_attrs = []
 
-        # IMDb/TMDb
-        imdb_id = attrs.get("imdb_id")
-        if imdb_id:
-            imdb_str = f"tt{imdb_id}" if not str(imdb_id).startswith("tt") else str(imdb_id)
-            torznab_attrs.append(f'<torznab:attr name="imdbid" value="{imdb_str}"/>')
+    # Category
+    category_id = torrent.category_id
+    if category_id and category_id in CATEGORY_MAP:
+        for torznab_cat in CATEGORY_MAP[category_id]:
+            torznab_attrs.append(f'<torznab:attr name="category" value="{torznab_cat}"/>')
+
+    torznab_attrs.append(f'<torznab:attr name="seeders" value="{seeders}"/>')
+    torznab_attrs.append(f'<torznab:attr name="peers" value="{seeders + leechers}"/>')
+
+    info_hash = torrent.info_hash
+    if info_hash:
+        torznab_attrs.append(f'<torznab:attr name="infohash" value="{info_hash}"/>')
+
+    # Freeleech
+    freeleech = torrent.freeleech
+    dl_factor = 0 if freeleech and freeleech != "0%" else 1
+    torznab_attrs.append(f'<torznab:attr name="downloadvolumefactor" value="{dl_factor}"/>')
+    torznab_attrs.append('<torznab:attr name="uploadvolumefactor" value="1"/>')
+
+    # IMDb/TMDb
+    imdb_id = torrent.imdb_id
+    if imdb_id:
+        imdb_str = f"tt{imdb_id}" if not str(imdb_id).startswith("tt") else str(imdb_id)
+        torznab_attrs.append(f'<torznab:attr name="imdbid" value="{imdb_str}"/>')
 
-        tmdb_id = attrs.get("tmdb_id")
-        if tmdb_id:
-            torznab_attrs.append(f'<torznab:attr name="tmdbid" value="{tmdb_id}"/>')
+    tmdb_id = torrent.tmdb_id
+    if tmdb_id:
+        torznab_attrs.append(f'<torznab:attr name="tmdbid" value="{tmdb_id}"/>')
 
-        # Escape XML special chars
-        title = escape_xml(attrs.get("name", "Unknown"))
-        download_link_escaped = escape_xml(download_link)
+    # Escape XML special chars
+    title = escape_xml(torrent.name)
+    download_link_escaped = escape_xml(download_link)
 
-        item_xml = f"""<item>
+    return f"""<item>
 <title>{title}</title>
 <guid>{GF_BASE_URL}/torrents/{torrent_id}</guid>
 <link>{download_link_escaped}</link>
@@ -339,18 +2420,84 @@ def build_torznab_xml(torrents: list[dict], query_type: str = "search", api_toke
 <size>{size}</size>
 <enclosure url="{download_link_escaped}" length="{size}" type="application/x-bittorrent"/>
 {chr(10).join(torznab_attrs)}
-</item>"""
-        items_xml.append(item_xml)
+</item>
+"""
+
+
+class ItemFragmentCache:
+    """
+    LRU cache of rendered <item> fragments, as bytes.
+
+    Keyed by the (frozen) TorrentRecord itself: its id plus every attribute the
+    fragment depends on act as the content version, so a seeders change renders
+    a new fragment while unchanged torrents shared by many feeds are rendered
+    only once.
+    """
 
-    return f'''<?xml version="1.0" encoding="UTF-8"?>
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._fragments: OrderedDict[TorrentRecord, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, torrent: TorrentRecord) -> bytes:
+        """Rendered fragment for a torrent, rendering it on a miss."""
+        key = torrent
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+        self.misses += 1
+        fragment = render_torznab_item(torrent).encode()
+        if self.max_entries > 0:
+            self._fragments[key] = fragment
+            if len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._fragments),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+item_fragments = ItemFragmentCache(ITEM_CACHE_SIZE)
+
+
+def iter_torznab_xml(torrents: list[TorrentRecord], query_type: str = "search", api_token: Optional[str] = None) -> Iterator[bytes]:
+    """Yield the Torznab RSS document piece by piece (header, one chunk per item, footer)."""
+    yield f'''<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:torznab="http://torznab.com/schemas/2015/feed">
 <channel>
 <title>GF-Free Proxy</title>
 <description>Generation-Free with 36h filter</description>
 <link>{GF_BASE_URL}</link>
-{chr(10).join(items_xml)}
-</channel>
-</rss>'''
+'''.encode()
+
+    for torrent in torrents:
+        yield item_fragments.get(torrent)
+
+    yield b"""</channel>
+</rss>"""
+
+
+async def stream_torznab_xml(torrents: list[TorrentRecord], query_type: str = "search", api_token: Optional[str] = None):
+    """Async wrapper so StreamingResponse does not hop to the threadpool per chunk."""
+    chunks = iter_torznab_xml(torrents, query_type, api_token)
+    rendering = 0.0
+    while True:
+        started = time.perf_counter()
+        chunk = next(chunks, None)
+        rendering += time.perf_counter() - started
+        if chunk is None:
+            break
+        yield chunk
+    XML_RENDER_SECONDS.observe(rendering)
 
 
 def build_caps_xml() -> str:
@@ -401,6 +2548,588 @@ def build_caps_xml() -> str:
     return f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_str}'
 
 
+# === GF WEB SESSIONS ===
+
+_BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Upstream headers forwarded to the *arr client on /download
+_DOWNLOAD_HEADERS = ("content-type", "content-disposition", "last-modified", "etag")
+
+
+class GFWebSession:
+    """
+    Logged-in GF website session, reused across /download calls.
+
+    The login (GET /login, credentials POST, TOTP 2FA POST) only runs when the
+    session has never logged in or GF answers a download with the login page.
+    The underlying httpx client is safe to share between concurrent downloads;
+    the lock only serializes re-logins.
+    """
+
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.logged_in = False
+        self.logins = 0
+        self._lock = asyncio.Lock()
+
+    async def login(self) -> None:
+        """Full login + 2FA flow on a fresh cookie jar."""
+        with DOWNLOAD_PHASE_SECONDS.time(phase="login"):
+            await self._login()
+
+    async def _login(self) -> None:
+        url = f"{GF_BASE_URL}/login"
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(
+                    connect=HTTP_CONNECT_TIMEOUT,
+                    read=HTTP_READ_TIMEOUT,
+                    write=HTTP_WRITE_TIMEOUT,
+                    pool=HTTP_POOL_TIMEOUT,
+                ),
+                headers={"User-Agent": _BROWSER_HEADERS["User-Agent"]},
+            )
+        client = self.client
+        client.cookies.clear()
+        self.logged_in = False
+
+        response = await client.get(url, timeout=10)
+        response.raise_for_status()
+
+        soup = BeautifulSoup(response.text, "html.parser")
+
+        token = soup.select_one('input[name="_token"]')["value"]
+        if not token:
+            raise RuntimeError("Token not found")
+        captcha = soup.select_one('input[name="_captcha"]')["value"]
+        if not captcha:
+            raise RuntimeError("Captcha not found")
+        match = re.search(r'name="([^"]+)"\s+value="(\d{10})"', response.text)
+        if not match:
+            raise RuntimeError("Match not found")
+        ts = match.group(1)
+        tsv = match.group(2)
+
+        payload = {
+            "_token": token,
+            "username": GF_USERNAME,
+            "password": GF_PASSWORD,
+            "_captcha": captcha,
+            "_username": "",
+            ts: tsv
+        }
+
+        headers = {
+            **_BROWSER_HEADERS,
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Origin": "https://example.com",
+            "Referer": url,
+        }
+
+        resp = await client.post(url, data=payload, headers=headers)
+        if not "Verifying..." in resp.text:
+            raise RuntimeError("Login failure")
+
+        tfa_url = f"{GF_BASE_URL}/two-factor-challenge"
+
+        totp = pyotp.TOTP(GF_OTP)
+        code = totp.now()
+
+        payload = {
+            "_token": token,
+            "code": code,
+            "recovery_code": "",
+            "_captcha": captcha,
+            "_username": "",
+            ts: tsv
+        }
+
+        resp = await client.post(tfa_url, data=payload, headers=headers)
+        resp.raise_for_status()
+        if not "/logout" in resp.text:
+            raise RuntimeError("2FA failure")
+
+        self.logged_in = True
+        self.logins += 1
+        logger.info(f"Logged in to GF website (login #{self.logins})")
+
+    async def ensure_login(self, seen_logins: Optional[int] = None) -> None:
+        """Log in if needed; skip if another download already re-logged in meanwhile."""
+        async with self._lock:
+            if not self.logged_in or (seen_logins is not None and self.logins == seen_logins):
+                await self.login()
+
+    @staticmethod
+    def is_logged_out(resp: httpx.Response) -> bool:
+        """
+        GF redirects to /login instead of serving the .torrent when the session
+        expired. Other HTML pages (404, too-young 403...) are plain errors and
+        must not trigger a new login.
+        """
+        if resp.status_code in (401, 419):
+            return True
+        return resp.url.path.rstrip("/").endswith("/login")
+
+    async def open_download(self, torrent_id: str) -> httpx.Response:
+        """
+        Open a streamed .torrent download, logging in again once if the session
+        expired. The caller must close the returned response.
+        """
+        await self.ensure_login()
+
+        dl_url = f"{GF_BASE_URL}/torrents/download/{torrent_id}"
+        for attempt in range(2):
+            seen_logins = self.logins
+            request = self.client.build_request("GET", dl_url, headers=_BROWSER_HEADERS)
+            resp = await self.client.send(request, stream=True)
+            if attempt == 0 and self.is_logged_out(resp):
+                await resp.aclose()
+                logger.info("GF web session expired, logging in again")
+                await self.ensure_login(seen_logins)
+                continue
+            break
+
+        if resp.is_error:
+            await resp.aclose()
+            resp.raise_for_status()
+        if self.is_logged_out(resp) or "text/html" in resp.headers.get("Content-Type", ""):
+            # Never relay (or cache) an HTML page as a .torrent
+            await resp.aclose()
+            raise RuntimeError(f"GF answered torrent {torrent_id} with an HTML page ({resp.url.path})")
+        return resp
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self.logged_in = False
+
+
+class GFSessionPool:
+    """Small pool of logged-in GF web sessions shared by /download (round-robin)."""
+
+    def __init__(self, size: int):
+        self.sessions = [GFWebSession() for _ in range(max(1, size))]
+        self._next = 0
+        self.active_downloads = 0
+
+    def acquire(self) -> GFWebSession:
+        session = self.sessions[self._next % len(self.sessions)]
+        self._next += 1
+        return session
+
+    async def aclose(self) -> None:
+        for session in self.sessions:
+            await session.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.sessions),
+            "logged_in": sum(1 for s in self.sessions if s.logged_in),
+            "logins": sum(s.logins for s in self.sessions),
+            "active_downloads": self.active_downloads,
+        }
+
+
+web_sessions = GFSessionPool(WEB_SESSION_POOL_SIZE)
+
+
+# === TORRENT FILE CACHE ===
+
+def _bencode_end(data: bytes, i: int) -> int:
+    """Index just past the bencoded value starting at data[i]."""
+    c = data[i:i + 1]
+    if c == b"i":
+        return data.index(b"e", i) + 1
+    if c in (b"l", b"d"):
+        i += 1
+        while data[i:i + 1] != b"e":
+            i = _bencode_end(data, i)
+        return i + 1
+    colon = data.index(b":", i)
+    return colon + 1 + int(data[i:colon])
+
+
+def torrent_info_hash(data: bytes) -> str:
+    """SHA-1 of the bencoded info dict (BitTorrent v1 info_hash)."""
+    if data[:1] != b"d":
+        raise ValueError("Not a bencoded dictionary")
+    i = 1
+    while data[i:i + 1] != b"e":
+        key_end = _bencode_end(data, i)
+        key = data[data.index(b":", i) + 1:key_end]
+        value_end = _bencode_end(data, key_end)
+        if key == b"info":
+            return hashlib.sha1(data[key_end:value_end]).hexdigest()
+        i = value_end
+    raise ValueError("No info dict")
+
+
+class TorrentFileCache:
+    """
+    On-disk, content-addressed cache of downloaded .torrent files.
+
+    Files are stored once per info_hash under objects/, and index.json maps GF
+    torrent ids to their info_hash and original headers. Eviction is LRU over
+    an OrderedDict (rebuilt from file mtimes on startup) once max_bytes is hit.
+    lookup() and store() run in worker threads (/download and the prefetcher):
+    the in-memory state is guarded by a threading lock that is never held
+    during file I/O.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(path, "objects")
+        self.index_path = os.path.join(path, "index.json")
+
+        self.ids: dict[str, dict] = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path) as f:
+                    self.ids = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable torrent cache index: {e}")
+
+        # info_hash -> size, least recently used first
+        self._lru: OrderedDict[str, int] = OrderedDict()
+        entries = []
+        for name in os.listdir(self.objects_dir) if os.path.isdir(self.objects_dir) else []:
+            if name.endswith(".torrent"):
+                stat = os.stat(os.path.join(self.objects_dir, name))
+                entries.append((stat.st_mtime, name[:-len(".torrent")], stat.st_size))
+        for _, info_hash, size in sorted(entries):
+            self._lru[info_hash] = size
+        self.bytes = sum(self._lru.values())
+        self.ids = {k: v for k, v in self.ids.items() if v.get("info_hash") in self._lru}
+        # info_hash -> GF torrent ids, so eviction only touches its own ids
+        self._hash_ids: dict[str, set[str]] = {}
+        for torrent_id, entry in self.ids.items():
+            self._hash_ids.setdefault(entry["info_hash"], set()).add(torrent_id)
+        # _lock guards the in-memory state only; _index_lock serializes index.json rewrites
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def object_path(self, info_hash: str) -> str:
+        return os.path.join(self.objects_dir, f"{info_hash}.torrent")
+
+    def _save_index(self) -> None:
+        """Rewrite index.json; only the in-memory snapshot is taken under the state lock."""
+        with self._index_lock:
+            with self._lock:
+                data = json.dumps(self.ids)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+
+    def lookup(self, torrent_id: str) -> Optional[tuple[str, dict]]:
+        """Path and headers of a cached .torrent, or None. Touches the file: call from a thread."""
+        with self._lock:
+            entry = self.ids.get(torrent_id)
+            if entry is None or entry["info_hash"] not in self._lru:
+                self.misses += 1
+                return None
+            info_hash = entry["info_hash"]
+            self._lru.move_to_end(info_hash)
+        path = self.object_path(info_hash)
+        try:
+            # mtime carries the LRU order across restarts
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.bytes -= self._lru.pop(info_hash, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path, entry.get("headers", {})
+
+    def store(self, torrent_id: str, data: bytes, headers: dict) -> str:
+        """Store a .torrent payload for torrent_id. Returns its info_hash."""
+        try:
+            info_hash = torrent_info_hash(data)
+        except (ValueError, IndexError):
+            # Not parseable: still content-addressed, by the hash of the whole file
+            info_hash = hashlib.sha1(data).hexdigest()
+
+        path = self.object_path(info_hash)
+        if info_hash not in self._lru:
+            # Same content under the same name, so concurrent writers can race harmlessly
+            os.makedirs(self.objects_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            if info_hash not in self._lru:
+                self._lru[info_hash] = len(data)
+                self.bytes += len(data)
+            self._lru.move_to_end(info_hash)
+
+            previous = self.ids.get(torrent_id)
+            if previous is not None and previous["info_hash"] != info_hash:
+                self._hash_ids.get(previous["info_hash"], set()).discard(torrent_id)
+            self.ids[torrent_id] = {"info_hash": info_hash, "headers": headers}
+            self._hash_ids.setdefault(info_hash, set()).add(torrent_id)
+            evicted = self._evict()
+
+        for old_hash in evicted:
+            try:
+                os.remove(self.object_path(old_hash))
+            except OSError:
+                pass
+        self._save_index()
+        return info_hash
+
+    def _evict(self) -> list[str]:
+        """Drop least recently used entries until under max_bytes; returns their info_hashes. Caller holds the lock."""
+        evicted = []
+        while self.bytes > self.max_bytes and len(self._lru) > 1:
+            info_hash, size = self._lru.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            evicted.append(info_hash)
+            for torrent_id in self._hash_ids.pop(info_hash, ()):
+                self.ids.pop(torrent_id, None)
+        return evicted
+
+    def writable(self) -> bool:
+        """Create the cache directory if needed and check it can be written to."""
+        try:
+            os.makedirs(self.objects_dir, exist_ok=True)
+        except OSError:
+            return False
+        return os.access(self.objects_dir, os.W_OK) and os.access(self.path, os.W_OK)
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._lru),
+            "ids": len(self.ids),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+torrent_cache: Optional[TorrentFileCache] = (
+    TorrentFileCache(TORRENT_CACHE_DIR, TORRENT_CACHE_MAX_BYTES) if TORRENT_CACHE_DIR else None
+)
+
+
+# === PREFETCH ===
+
+_prefetch_queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+_prefetch_pending: set[str] = set()
+_prefetch_stats = {"queued": 0, "downloaded": 0, "skipped": 0, "failed": 0}
+
+
+def _prefetch_wanted(torrent: TorrentRecord) -> bool:
+    """Apply the PREFETCH_CATEGORIES / PREFETCH_MIN_SEEDERS filters."""
+    if torrent.seeders < PREFETCH_MIN_SEEDERS:
+        return False
+    if PREFETCH_CATEGORIES:
+        torznab_cats = CATEGORY_MAP.get(torrent.category_id, [])
+        if not any(cat in PREFETCH_CATEGORIES for cat in torznab_cats):
+            return False
+    return True
+
+
+def queue_prefetch(torrents: list[TorrentRecord]) -> None:
+    """Queue the top PREFETCH_TOP_N wanted torrents of a feed for background download."""
+    if not PREFETCH_ENABLED or torrent_cache is None:
+        return
+
+    queued = 0
+    for torrent in torrents:
+        if queued >= PREFETCH_TOP_N:
+            break
+        torrent_id = torrent.id
+        if not torrent_id or not _prefetch_wanted(torrent):
+            continue
+        queued += 1
+        if torrent_id in _prefetch_pending or torrent_id in torrent_cache.ids:
+            continue
+        try:
+            _prefetch_queue.put_nowait(torrent_id)
+        except asyncio.QueueFull:
+            break
+        _prefetch_pending.add(torrent_id)
+        _prefetch_stats["queued"] += 1
+
+
+async def download_to_cache(torrent_id: str) -> None:
+    """Download a .torrent from GF straight into the disk cache."""
+    await upstream.acquire(PRIORITY_BACKGROUND)
+    resp = await web_sessions.acquire().open_download(torrent_id)
+    try:
+        data = await resp.aread()
+    finally:
+        await resp.aclose()
+    headers = {k: v for k, v in resp.headers.items() if k.lower() in _DOWNLOAD_HEADERS}
+    await asyncio.to_thread(torrent_cache.store, torrent_id, data, headers)
+
+
+async def run_prefetcher() -> None:
+    """Background task: drain the prefetch queue, one GF download every PREFETCH_INTERVAL seconds."""
+    while True:
+        torrent_id = await _prefetch_queue.get()
+        try:
+            if torrent_id in torrent_cache.ids:
+                _prefetch_stats["skipped"] += 1
+                continue
+            await download_to_cache(torrent_id)
+            _prefetch_stats["downloaded"] += 1
+            logger.info(f"Prefetched torrent {torrent_id}")
+        except Exception as e:
+            _prefetch_stats["failed"] += 1
+            logger.warning(f"Prefetch of torrent {torrent_id} failed: {e}")
+        finally:
+            _prefetch_pending.discard(torrent_id)
+        # Rate limit against GF
+        await asyncio.sleep(PREFETCH_INTERVAL)
+
+
+def prefetch_stats() -> dict:
+    return {**_prefetch_stats, "queue_depth": _prefetch_queue.qsize()}
+
+
+# === WARM SNAPSHOT ===
+
+_SNAPSHOT_MAGIC = b"GFSNAP1\n"
+
+
+class WarmSnapshot:
+    """
+    Read side of a snapshot file, memory-mapped.
+
+    Layout: magic, header length (u32 LE), JSON header (frontier hints, RSS
+    windows, [key, offset, length, expires_at] per cache entry), then the
+    encoded cache values back to back. Only the header is parsed at startup;
+    a value is decoded when its key is first looked up (TTLCache._restore).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+            self._map.close()
+            raise ValueError("not a gf-free-proxy snapshot")
+        start = len(_SNAPSHOT_MAGIC) + 4
+        header_len = int.from_bytes(self._map[len(_SNAPSHOT_MAGIC):start], "little")
+        header = json.loads(self._map[start:start + header_len])
+        base = start + header_len
+        self.created = header["created"]
+        self.frontier_hints: dict[str, int] = header.get("frontier_hints", {})
+        self.rss_windows: dict[str, dict] = header.get("rss_windows", {})
+        self._entries = {
+            key: (base + offset, length, expires_at) for key, offset, length, expires_at in header["entries"]
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+    def peek(self, key: str) -> Optional[tuple[bytes, float]]:
+        item = self._entries.get(key)
+        if item is None or self._map.closed:
+            return None
+        offset, length, expires_at = item
+        return self._map[offset:offset + length], expires_at
+
+    def take(self, key: str) -> Optional[tuple[bytes, float]]:
+        """Value bytes and expiry of a key, removed from the snapshot."""
+        taken = self.peek(key)
+        self._entries.pop(key, None)
+        if not self._entries:
+            self.close()
+        return taken
+
+    def close(self) -> None:
+        self._entries.clear()
+        if not self._map.closed:
+            self._map.close()
+
+
+def load_snapshot(path: str) -> Optional[WarmSnapshot]:
+    """Open the snapshot and restore the small state eagerly (frontier hints, RSS windows)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = WarmSnapshot(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    for shape, page in snapshot.frontier_hints.items():
+        if shape.startswith("rss:"):
+            _frontier_hints.setdefault(shape, page)
+    for shape, data in snapshot.rss_windows.items():
+        _rss_windows.setdefault(shape, RssWindow.from_dict(data))
+    logger.info(
+        f"Loaded snapshot from {time.time() - snapshot.created:.0f}s ago: "
+        f"{len(snapshot)} cache entries, {len(snapshot.frontier_hints)} frontier hints"
+    )
+    return snapshot
+
+
+def _write_snapshot_file(path: str, header: dict, blobs: list[bytes]) -> None:
+    header_bytes = json.dumps(header, default=_json_default).encode()
+    # Per-process tmp file: uvicorn workers all save at shutdown, at the same time
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+    # Atomic swap: a crash mid-write never leaves a truncated snapshot
+    os.replace(tmp_path, path)
+
+
+async def save_snapshot(path: str) -> int:
+    """Write the cache, frontier hints and RSS windows to path; returns the number of cache entries."""
+    entries, blobs = [], []
+    offset = 0
+    for key, data, expires_at in search_cache.snapshot_items():
+        entries.append([key, offset, len(data), expires_at])
+        blobs.append(data)
+        offset += len(data)
+    header = {
+        "created": time.time(),
+        "frontier_hints": dict(_frontier_hints),
+        "rss_windows": {shape: window.to_dict() for shape, window in _rss_windows.items()},
+        "entries": entries,
+    }
+    await asyncio.to_thread(_write_snapshot_file, path, header, blobs)
+    return len(entries)
+
+
+async def run_snapshot_saver() -> None:
+    """Background task: save a snapshot every SNAPSHOT_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        try:
+            saved = await save_snapshot(SNAPSHOT_PATH)
+            logger.info(f"Saved snapshot ({saved} cache entries)")
+        except Exception as e:
+            logger.warning(f"Snapshot save failed: {e}")
+
+
 # === ENDPOINTS ===
 
 @app.get("/api", response_class=Response)
@@ -416,13 +3145,17 @@ async def torznab_api(
     offset: Optional[int] = Query(None, description="Result offset"),
 ):
     """Main Torznab API endpoint."""
+    started = time.perf_counter()
+    api_type = t if t in _API_TYPES else "other"
 
     # Capabilities request
     if t == "caps":
-        return Response(
+        response = Response(
             content=build_caps_xml(),
             media_type="application/xml",
         )
+        API_REQUEST_SECONDS.observe(time.perf_counter() - started, t=api_type)
+        return response
 
     # Parse categories
     categories = None
@@ -438,64 +3171,76 @@ async def torznab_api(
 
         rss_start_page = 1
 
-        torrents = await fetch_gf_torrents(
-            query=q,
-            categories=categories,
-            imdb_id=imdbid,
-            season=season,
-            episode=ep,
-            api_token=apikey,
-            start_page=rss_start_page,
-        )
+        try:
+            results = await fetch_gf_torrents(
+                query=q,
+                categories=categories,
+                imdb_id=imdbid,
+                season=season,
+                episode=ep,
+                api_token=apikey,
+                start_page=rss_start_page,
+            )
+        except UpstreamError as e:
+            logger.error(f"{e}")
+            API_REQUEST_SECONDS.observe(time.perf_counter() - started, t=api_type)
+            return Response(
+                content='<?xml version="1.0" encoding="UTF-8"?><error code="900" description="GF unavailable"/>',
+                media_type="application/xml",
+                status_code=503,
+            )
+
+        # Apply offset/limit, extending the result set from where its scan stopped
+        offset = offset or 0
+        count = min(limit or RESULTS_LIMIT, RESULTS_LIMIT)
+        if offset:
+            await results.ensure(offset + count, apikey or GF_API_TOKEN)
+        torrents = results.items[offset:offset + count]
 
         # Mock result for indexer validation tests (empty search)
         # Sonarr/Radarr/Prowlarr test indexers by searching without query
         # If no results, provide a mock to pass validation
         # We return both a Movie and TV mock so both Radarr and Sonarr validate successfully
-        if not torrents and not q and not imdbid:
+        if not torrents and not q and not imdbid and not offset:
             logger.info("Validation test detected - returning mock results (Movie + TV)")
-            mock_movie = {
-                "id": "mock-validation-movie",
-                "attributes": {
-                    "name": "GF-Free Proxy Validation Movie",
-                    "created_at": "2020-01-01T00:00:00Z",
-                    "size": 1000000000,
-                    "seeders": 10,
-                    "leechers": 2,
-                    "category_id": 1,  # Films
-                    "info_hash": "0000000000000000000000000000000000000000",
-                    "freeleech": "0%",
-                }
-            }
-            mock_tv = {
-                "id": "mock-validation-tv",
-                "attributes": {
-                    "name": "GF-Free Proxy Validation TV",
-                    "created_at": "2020-01-01T00:00:00Z",
-                    "size": 1000000000,
-                    "seeders": 10,
-                    "leechers": 2,
-                    "category_id": 2,  # Séries
-                    "info_hash": "0000000000000000000000000000000000000001",
-                    "freeleech": "0%",
-                }
-            }
+            mock_movie = TorrentRecord(
+                id="mock-validation-movie",
+                name="GF-Free Proxy Validation Movie",
+                created_ts=parse_timestamp("2020-01-01T00:00:00Z"),
+                size=1000000000,
+                seeders=10,
+                leechers=2,
+                category_id=1,  # Films
+                info_hash="0000000000000000000000000000000000000000",
+                freeleech="0%",
+            )
+            mock_tv = TorrentRecord(
+                id="mock-validation-tv",
+                name="GF-Free Proxy Validation TV",
+                created_ts=parse_timestamp("2020-01-01T00:00:00Z"),
+                size=1000000000,
+                seeders=10,
+                leechers=2,
+                category_id=2,  # Séries
+                info_hash="0000000000000000000000000000000000000001",
+                freeleech="0%",
+            )
             torrents = [mock_movie, mock_tv]
-
-        # Apply offset/limit if provided
-        if offset:
-            torrents = torrents[offset:]
-        if limit:
-            torrents = torrents[:limit]
+        else:
+            # Warm the .torrent cache for the items the *arr is likely to grab next
+            queue_prefetch(torrents)
 
         logger.info(f"Returning {len(torrents)} eligible torrents")
 
-        return Response(
-            content=build_torznab_xml(torrents, t, api_token=apikey),
-            media_type="application/xml",
-        )
+        async def body():
+            async for chunk in stream_torznab_xml(torrents, t, api_token=apikey):
+                yield chunk
+            API_REQUEST_SECONDS.observe(time.perf_counter() - started, t=api_type)
+
+        return StreamingResponse(body(), media_type="application/xml")
 
     # Unknown request type
+    API_REQUEST_SECONDS.observe(time.perf_counter() - started, t=api_type)
     return Response(
         content='<?xml version="1.0" encoding="UTF-8"?><error code="201" description="Unknown request type"/>',
         media_type="application/xml",
@@ -514,132 +3259,91 @@ async def health_check():
             "max_pages": MAX_PAGES,
             "results_limit": RESULTS_LIMIT,
             "cache_ttl": CACHE_TTL_SECONDS,
+            "cache_stale": CACHE_STALE_SECONDS,
+            "search_strategy": SEARCH_STRATEGY,
+            "search_fanout": SEARCH_FANOUT,
         },
-        "cache_entries": len(_cache),
+        "frontier_hints": _frontier_hints,
+        "cache_entries": len(search_cache),
+        "cache": search_cache.stats(),
+        "http_pool": http_pool_stats(),
+        "upstream": upstream.stats(),
+        "index": torrent_index.stats() if torrent_index is not None else None,
+        "web_sessions": web_sessions.stats(),
+        "torrent_cache": torrent_cache.stats() if torrent_cache is not None else None,
+        "prefetch": prefetch_stats() if PREFETCH_ENABLED else None,
+        "item_fragments": item_fragments.stats(),
+        "eligibility_horizon": eligibility_horizon.stats(),
+        "batches": search_batcher.stats(),
+        "rss_windows": {shape or "all": window.stats() for shape, window in _rss_windows.items()},
     }
 
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics (text exposition format)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint with service info."""
     return PlainTextResponse(
         "GF-Free Proxy - Torznab API at /api\n"
         "Health check at /health\n"
+        "Prometheus metrics at /metrics\n"
         f"Filtering torrents older than {MIN_AGE_HOURS}h\n"
     )
 
 @app.get("/download")
-def download(id: str):
-
-    print(f'Received download torrent {id}')
-
-    url = f"{GF_BASE_URL}/login"
-
-    session = requests.Session()
-
-    #print('Login')
-    headers = {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)"
-    }
-    response = session.get(url, timeout=10, headers=headers)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    token = soup.select_one('input[name="_token"]')["value"]
-    if not token:
-        raise RuntimeError("Token not found")
-    captcha = soup.select_one('input[name="_captcha"]')["value"]
-    if not captcha:
-        raise RuntimeError("Captcha not found")
-    match = re.search(r'name="([^"]+)"\s+value="(\d{10})"', response.text)
-    if not match:
-        raise RuntimeError("Match not found")
-    ts = match.group(1)
-    tsv = match.group(2)
-
-    payload = {
-        "_token": token,
-        "username": GF_USERNAME,
-        "password": GF_PASSWORD,
-        "_captcha": captcha,
-        "_username": "",
-        ts: tsv
-    }
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Origin": "https://example.com",
-        "Referer": url,
-    }
-
-    resp = session.post(url, data=payload, headers=headers)
-    #resp.raise_for_status()
-    #print(f'POST login={resp.status_code}')
-    if not "Verifying..." in resp.text:
-        raise RuntimeError("Login failure")
-    #print(resp.text)
-
-    #print('2FA')
-    tfa_url = f"{GF_BASE_URL}/two-factor-challenge"
-
-    totp = pyotp.TOTP(GF_OTP)
-    code = totp.now()
-
-    payload = {
-        "_token": token,
-        "code": code,
-        "recovery_code": "",
-        "_captcha": captcha,
-        "_username": "",
-        ts: tsv
-    }
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Origin": "https://example.com",
-        "Referer": url,
-    }
-
-    resp = session.post(tfa_url, data=payload, headers=headers)
-    resp.raise_for_status()
-    #print(f'POST 2FA={resp.status_code}')
-    if not "/logout" in resp.text:
-        raise RuntimeError("2FA failure")
-    #print(resp.text)
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    logoutToken = soup.select_one('input[name="_token"]')["value"]
-    if not logoutToken:
-        raise RuntimeError("logoutToken not found")
-
-    #print('Download')
-    dl_url = f"{GF_BASE_URL}/torrents/download/{id}"
-    resp = session.get(dl_url, headers=headers)
-    resp.raise_for_status()
-
-    #print('Logout')
-    payload = {
-        "_token": logoutToken,
-    }
-
-    respLogout = session.post(f"{GF_BASE_URL}/logout", data=payload, headers=headers)
-    respLogout.raise_for_status()
-    if "/logout" in respLogout.text:
-        raise RuntimeError("Logout failure")
-    if not "Login" in respLogout.text:
-        raise RuntimeError("Logout failure")
+async def download(id: str):
+    """Serve a .torrent from the disk cache, or stream it from GF and keep a copy."""
+    logger.info(f"Received download torrent {id}")
+    started = time.perf_counter()
+
+    if torrent_cache is not None:
+        cached = await asyncio.to_thread(torrent_cache.lookup, id)
+        if cached is not None:
+            path, headers = cached
+            logger.info(f"Torrent {id} served from disk cache")
+            DOWNLOAD_PHASE_SECONDS.observe(time.perf_counter() - started, phase="cache")
+            # FileResponse lets the server use sendfile/pathsend when it supports it
+            return FileResponse(path, headers=headers, media_type="application/x-bittorrent")
+
+    resp = await web_sessions.acquire().open_download(id)
+    DOWNLOAD_PHASE_SECONDS.observe(time.perf_counter() - started, phase="upstream")
+
+    # Only forward headers that still hold once httpx has decoded the body
+    headers = {k: v for k, v in resp.headers.items() if k.lower() in _DOWNLOAD_HEADERS}
+    if "content-length" in resp.headers and "content-encoding" not in resp.headers:
+        headers["Content-Length"] = resp.headers["content-length"]
+
+    async def body():
+        web_sessions.active_downloads += 1
+        chunks = [] if torrent_cache is not None else None
+        transfer_started = time.perf_counter()
+        try:
+            async for chunk in resp.aiter_bytes(chunk_size=8192):
+                if chunks is not None:
+                    chunks.append(chunk)
+                yield chunk
+        finally:
+            web_sessions.active_downloads -= 1
+            await resp.aclose()
+        DOWNLOAD_PHASE_SECONDS.observe(time.perf_counter() - transfer_started, phase="transfer")
+        # Only reached when the whole body was relayed
+        if chunks is not None:
+            cache_headers = {k: v for k, v in headers.items() if k.lower() != "content-length"}
+            try:
+                await asyncio.to_thread(torrent_cache.store, id, b"".join(chunks), cache_headers)
+            except Exception as e:
+                # The client already has the whole file: a cache failure must not break the response
+                logger.warning(f"Caching torrent {id} failed: {e}")
 
-    #return resp.text
     return StreamingResponse(
-        resp.iter_content(chunk_size=8192),
-        headers=resp.headers
+        body(),
+        headers=headers,
+        media_type=resp.headers.get("content-type", "application/x-bittorrent"),
     )
 
 if __name__ == "__main__":
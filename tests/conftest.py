@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# No disk side effects from importing main
+os.environ.setdefault("TORRENT_CACHE_DIR", "")
@@ -0,0 +1,26 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("variants", [
+    ["Batman", "batman ", "  BATMAN"],
+    ["Spider Man", "spider   man"],
+])
+def test_equivalent_queries_share_key_and_upstream_query(variants):
+    queries = {main.normalize_query(q) for q in variants}
+    assert len(queries) == 1
+
+
+@pytest.mark.parametrize("query", ["C++", "C#", "Spider-Man", "Straße"])
+def test_key_query_is_what_gf_receives(query):
+    """One cache key maps to exactly one upstream query."""
+    normalized = main.normalize_query(query)
+    assert main.build_gf_params("t", normalized)["name"] == normalized
+    assert normalized == query.lower()
+
+
+def test_distinct_queries_get_distinct_keys():
+    keys = {main.search_cache_key("t", main.normalize_query(q), None, None, None, None)
+            for q in ["C++", "C#", "C", "Spider-Man", "Spider Man"]}
+    assert len(keys) == 5
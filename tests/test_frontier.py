@@ -0,0 +1,135 @@
+"""
+Scénarios de future_plans/adaptive-frontier-detection.md, contre un faux
+listing GF (25 torrents par page, plus récents d'abord).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import main
+
+YOUNG, MIX, OLD = "young", "mix", "old"
+
+
+def make_listing(kinds: list[str]) -> list[list[main.TorrentRecord]]:
+    """One page per kind: all too young, half/half, or all eligible."""
+    now = time.time()
+    young_ts = now - 3600
+    old_ts = now - (main.MIN_AGE_HOURS + 1) * 3600
+    pages, next_id = [], 900000
+    for kind in kinds:
+        page = []
+        for i in range(main.GF_PER_PAGE):
+            young = kind == YOUNG or (kind == MIX and i < main.GF_PER_PAGE // 2)
+            page.append(main.TorrentRecord(
+                id=str(next_id), name=f"Show.S01E01.{next_id}", created_ts=young_ts if young else old_ts,
+                size=1, seeders=1, leechers=0, category_id=2, info_hash=None, freeleech="0%",
+                imdb_id=None, tmdb_id=None, season=1, episode=1,
+            ))
+            next_id -= 1
+        pages.append(page)
+    return pages
+
+
+@pytest.fixture
+def gf(monkeypatch):
+    """Serve a listing through fetch_gf_page and record the pages requested."""
+    state = {"listing": [], "requested": [], "failing": set()}
+
+    async def fake_fetch_gf_page(client, params, page, priority=main.PRIORITY_INTERACTIVE):
+        state["requested"].append(page)
+        if page in state["failing"]:
+            return None
+        listing = state["listing"]
+        return listing[page - 1] if page <= len(listing) else []
+
+    monkeypatch.setattr(main, "fetch_gf_page", fake_fetch_gf_page)
+    monkeypatch.setattr(main, "_frontier_hints", {})
+    return state
+
+
+def scan(params: dict, start_page: int = 1):
+    fetcher = main.PageFetcher(None, params)
+    items, next_page = asyncio.run(main.scan_frontier(fetcher, main.query_shape(params), start_page))
+    return items, next_page, fetcher
+
+
+RSS = {"api_token": "t", "perPage": main.GF_PER_PAGE}
+
+
+def test_low_flux_walks_back_from_the_hint(gf):
+    """Frontier before the remembered page: gallop back, nothing eligible is skipped."""
+    gf["listing"] = make_listing([MIX, MIX] + [OLD] * 10)
+    main._frontier_hints[main.query_shape(RSS)] = 5
+
+    items, next_page, _ = scan(RSS)
+
+    assert gf["requested"][0] == 5
+    assert items[0].id == gf["listing"][0][main.GF_PER_PAGE // 2].id
+    assert len(items) >= main.RESULTS_LIMIT
+    assert main._frontier_hints[main.query_shape(RSS)] == 1
+
+
+def test_normal_flux_gallops_forward(gf):
+    """Pages 1-7 too young, page 8 mixed: found in a few probes instead of 8 requests."""
+    gf["listing"] = make_listing([YOUNG] * 7 + [MIX] + [OLD] * 10)
+    main._frontier_hints[main.query_shape(RSS)] = 5
+
+    items, next_page, _ = scan(RSS)
+
+    assert items[0].id == gf["listing"][7][main.GF_PER_PAGE // 2].id
+    probes = gf["requested"][:gf["requested"].index(8) + 1]
+    assert len(probes) < 8
+    assert not {1, 2, 3, 4} & set(gf["requested"])
+    assert main._frontier_hints[main.query_shape(RSS)] == 8
+
+
+def test_high_flux_gives_up_at_max_pages(gf):
+    """Frontier past MAX_PAGES: few requests, no results, resumable after MAX_PAGES."""
+    gf["listing"] = make_listing([YOUNG] * (main.MAX_PAGES + 5))
+    main._frontier_hints[main.query_shape(RSS)] = 5
+
+    items, next_page, fetcher = scan(RSS)
+
+    assert items == []
+    assert next_page == main.MAX_PAGES + 1
+    assert fetcher.requests <= 5
+
+
+def test_upstream_error_is_resumable(gf):
+    """A failing probe must not mark the scan exhausted: resume after the last all-young page."""
+    gf["listing"] = make_listing([YOUNG] * 7 + [MIX] + [OLD] * 10)
+    gf["failing"] = {7}
+    main._frontier_hints[main.query_shape(RSS)] = 5
+
+    items, next_page, _ = scan(RSS)
+
+    assert items == []
+    assert next_page == 7
+
+    gf["failing"] = set()
+    items, next_page, _ = scan(RSS, next_page)
+
+    assert items[0].id == gf["listing"][7][main.GF_PER_PAGE // 2].id
+
+
+def test_text_search_ignores_rss_hint(gf):
+    """A rare query is eligible from page 1: the RSS frontier must not be probed first."""
+    gf["listing"] = make_listing([OLD])
+    main._frontier_hints[main.query_shape(RSS)] = 8
+    params = {**RSS, "name": "rare title"}
+
+    items, next_page, _ = scan(params)
+
+    assert gf["requested"] == [1, 2]
+    assert next_page is None
+    assert len(items) == main.GF_PER_PAGE
+    assert main._frontier_hints == {main.query_shape(RSS): 8}
+
+
+def test_query_shape():
+    assert main.query_shape({**RSS, "categories[0]": 2}) == "rss:[2]:False:False"
+    assert main.query_shape({**RSS, "name": "x"}) is None
+    assert main.query_shape({**RSS, "imdbId": "123"}) is None
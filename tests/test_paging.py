@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import main
+
+
+def record(torrent_id: int, created_ts: float) -> main.TorrentRecord:
+    return main.TorrentRecord(
+        id=str(torrent_id), name=f"Show.S01E01.{torrent_id}", created_ts=created_ts, size=1, seeders=1,
+        leechers=0, category_id=2, info_hash=None, freeleech="0%", imdb_id=None, tmdb_id=None,
+        season=1, episode=1,
+    )
+
+
+def test_ensure_with_fanout_after_shifted_pages(monkeypatch):
+    """
+    Page 2 repeats page 1 (new uploads shifted the listing), so the set is
+    still short after the first scan and the same fetcher scans again over
+    pages whose look-ahead fetches were cancelled.
+    """
+    old_ts = time.time() - (main.MIN_AGE_HOURS + 1) * 3600
+    requested = []
+
+    async def fake_fetch_gf_page(client, params, page, priority=main.PRIORITY_INTERACTIVE):
+        requested.append(page)
+        await asyncio.sleep(0.01 * page)  # later pages are still in flight when the scan stops
+        first = 0 if page <= 2 else (page - 2) * main.GF_PER_PAGE
+        return [record(900000 - first - i, old_ts) for i in range(main.GF_PER_PAGE)]
+
+    monkeypatch.setattr(main, "fetch_gf_page", fake_fetch_gf_page)
+    monkeypatch.setattr(main, "get_http_client", lambda: None)
+    monkeypatch.setattr(main, "SEARCH_FANOUT", 4)
+
+    async def run():
+        results = main.ResultSet([], {"perPage": main.GF_PER_PAGE}, next_page=1)
+        return await results.ensure(2 * main.GF_PER_PAGE, "token")
+
+    items = asyncio.run(run())
+
+    assert len(items) == 2 * main.GF_PER_PAGE
+    assert len({t.id for t in items}) == len(items)
+    assert requested.count(3) == 2  # cancelled look-ahead, then fetched again
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+
+import pytest
+
+import main
+
+
+def bencode(value) -> bytes:
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, list):
+        return b"l" + b"".join(map(bencode, value)) + b"e"
+    return b"d" + b"".join(bencode(k) + bencode(v) for k, v in sorted(value.items())) + b"e"
+
+
+INFO = {"length": 1073741824, "name": "Show.S01E01.mkv", "piece length": 16777216, "pieces": b"\x00e:" * 20}
+
+
+def make_torrent(**extra) -> bytes:
+    return bencode({"announce": "https://tracker.example/announce", "info": INFO, **extra})
+
+
+def test_info_hash_is_sha1_of_info_dict():
+    assert main.torrent_info_hash(make_torrent()) == hashlib.sha1(bencode(INFO)).hexdigest()
+
+
+def test_info_hash_ignores_tracker_specific_fields():
+    """Same payload with another passkey/comment: same info_hash."""
+    other = make_torrent(comment="other", **{"announce-list": [["https://a/1"], ["https://b/2"]]})
+    assert main.torrent_info_hash(other) == main.torrent_info_hash(make_torrent())
+
+
+@pytest.mark.parametrize("data", [b"<html>Login</html>", b"d8:announce3:urle", b""])
+def test_info_hash_rejects_non_torrents(data):
+    with pytest.raises(ValueError):
+        main.torrent_info_hash(data)
+
+
+def test_store_and_lookup(tmp_path):
+    cache = main.TorrentFileCache(str(tmp_path), 1 << 20)
+    info_hash = cache.store("42", make_torrent(), {"content-type": "application/x-bittorrent"})
+
+    path, headers = cache.lookup("42")
+    assert open(path, "rb").read() == make_torrent()
+    assert headers == {"content-type": "application/x-bittorrent"}
+    assert info_hash == main.torrent_info_hash(make_torrent())
+    # Index survives a restart
+    assert main.TorrentFileCache(str(tmp_path), 1 << 20).lookup("42") is not None
+
+
+def test_eviction_drops_ids_of_evicted_files(tmp_path):
+    payloads = {str(i): make_torrent(comment="x" * 1000, info={**INFO, "name": f"{i}.mkv"}) for i in range(5)}
+    size = len(payloads["0"])
+    cache = main.TorrentFileCache(str(tmp_path), 3 * size)
+    for torrent_id, data in payloads.items():
+        cache.store(torrent_id, data, {})
+
+    assert cache.bytes <= 3 * size
+    assert cache.lookup("0") is None
+    assert cache.lookup("4") is not None
+    assert set(cache.ids) == {"2", "3", "4"}
+
+
+def test_concurrent_stores(tmp_path):
+    cache = main.TorrentFileCache(str(tmp_path), 20_000)
+    errors = []
+
+    def worker(n: int) -> None:
+        for i in range(100):
+            data = make_torrent(info={**INFO, "name": f"{n}-{i}.mkv"})
+            try:
+                cache.store(f"{n}-{i}", data, {})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(entry["info_hash"] in cache._lru for entry in cache.ids.values())
+
+
+def test_unwritable_directory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    assert not main.TorrentFileCache(str(blocker / "cache"), 1 << 20).writable()
+    assert main.TorrentFileCache(str(tmp_path / "cache"), 1 << 20).writable()
+
+
+def test_download_survives_cache_store_failure(tmp_path, monkeypatch):
+    """The client gets the whole file even if the disk cache cannot keep it."""
+    from fastapi.testclient import TestClient
+
+    payload = make_torrent()
+
+    class FailingCache(main.TorrentFileCache):
+        def store(self, torrent_id, data, headers):
+            raise OSError(28, "No space left on device")
+
+    class FakeSession:
+        async def open_download(self, torrent_id):
+            # No Content-Length: relayed as a chunked response
+            return main.httpx.Response(200, headers={"Content-Type": "application/x-bittorrent"},
+                                       stream=main.httpx.ByteStream(payload))
+
+    monkeypatch.setattr(main, "torrent_cache", FailingCache(str(tmp_path), 1 << 20))
+    monkeypatch.setattr(main.web_sessions, "acquire", lambda: FakeSession())
+
+    response = TestClient(main.app).get("/download", params={"id": "42"})
+    assert response.status_code == 200
+    assert response.content == payload
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for expiry."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+    return now
+
+
+def test_get_set_and_expiry(clock):
+    cache = main.TTLCache(ttl=60)
+    cache.set("a", [1])
+    assert cache.get("a") == [1]
+    assert cache.get("b") is None
+
+    clock[0] += 61
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.expirations) == (1, 2, 1)
+
+
+def test_earlier_deadline_expires_first(clock):
+    """A value imported with its own expiry is purged even behind a later deadline."""
+    cache = main.TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, expires_at=clock[0] + 10)
+
+    clock[0] += 20
+    assert cache.get("a") == 1
+    assert len(cache) == 1
+    assert cache.expirations == 1
+
+
+def test_lru_eviction_by_entries(clock):
+    cache = main.TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_eviction_by_bytes(clock):
+    cache = main.TTLCache(ttl=60, max_entries=100, max_bytes=25)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+    cache.set("c", "z" * 10)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.bytes <= 25
+
+
+def test_get_or_fetch_coalesces_concurrent_fills():
+    cache = main.TTLCache(ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == [["result"]] * 5
+    assert calls == 1
+    assert (cache.misses, cache.coalesced) == (1, 4)
+
+
+def test_stale_while_revalidate(clock):
+    cache = main.TTLCache(ttl=60, stale_ttl=600)
+    versions = iter(["v1", "v2"])
+
+    async def fetch():
+        return next(versions)
+
+    async def run():
+        assert await cache.get_or_fetch("k", fetch) == "v1"
+        clock[0] += 120  # expired, still within the stale window
+        assert await cache.get_or_fetch("k", fetch) == "v1"
+        await asyncio.sleep(0)  # let the background refresh run
+        assert await cache.get_or_fetch("k", fetch) == "v2"
+
+    asyncio.run(run())
+    assert (cache.stale_hits, cache.refreshes) == (1, 1)
+
+    clock[0] += 60 + 600
+    assert cache.get("k") is None
+
+
+def test_shared_sqlite_backend(tmp_path):
+    """A second worker reads the value filled by the first one instead of fetching."""
+    path = str(tmp_path / "cache.db")
+    workers = [
+        main.TTLCache(ttl=60, encode=lambda v: json.dumps(v).encode(), decode=json.loads)
+        for _ in range(2)
+    ]
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {"items": [1, 2, 3]}
+
+    async def run():
+        for cache in workers:
+            cache.backend = main.SQLiteCacheBackend(path)
+        return [await cache.get_or_fetch("k", fetch) for cache in workers]
+
+    assert asyncio.run(run()) == [{"items": [1, 2, 3]}] * 2
+    assert calls == 1
+    assert workers[1].shared_hits == 1
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def record(torrent_id: int, created_ts: float) -> main.TorrentRecord:
+    return main.TorrentRecord(
+        id=str(torrent_id), name=f"Rare.Title.{torrent_id}", created_ts=created_ts, size=1, seeders=1,
+        leechers=0, category_id=1, info_hash=None, freeleech="0%", imdb_id=None, tmdb_id=None,
+    )
+
+
+@pytest.fixture
+def gf(monkeypatch):
+    """One page of eligible torrents, or an upstream error for every page when down."""
+    state = {"down": False}
+    old_ts = time.time() - (main.MIN_AGE_HOURS + 1) * 3600
+
+    async def fake_fetch_gf_page(client, params, page, priority=main.PRIORITY_INTERACTIVE):
+        if state["down"]:
+            return None
+        return [record(900000 - i, old_ts) for i in range(3)] if page == 1 else []
+
+    monkeypatch.setattr(main, "fetch_gf_page", fake_fetch_gf_page)
+    monkeypatch.setattr(main, "get_http_client", lambda: None)
+    monkeypatch.setattr(main, "search_cache", main.TTLCache(ttl=60, stale_ttl=600))
+    monkeypatch.setattr(main, "_frontier_hints", {})
+    return state
+
+
+def test_failed_refresh_keeps_the_stale_entry(gf, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+
+    async def run():
+        first = await main.fetch_gf_torrents(query="rare title", api_token="t")
+        gf["down"] = True
+        now[0] += 120  # expired, still within the stale window
+        stale = await main.fetch_gf_torrents(query="rare title", api_token="t")
+        await asyncio.sleep(0.05)  # let the background refresh fail
+        after = await main.fetch_gf_torrents(query="rare title", api_token="t")
+        return first, stale, after
+
+    first, stale, after = asyncio.run(run())
+
+    assert len(first.items) == 3
+    assert stale is first and after is first
+    assert main.search_cache.refreshes >= 1
+
+
+def test_search_fails_without_caching_or_mock_items(gf):
+    gf["down"] = True
+    client = TestClient(main.app)
+
+    response = client.get("/api", params={"t": "search", "apikey": "t"})
+
+    assert response.status_code == 503
+    assert "mock-validation" not in response.text
+    assert len(main.search_cache) == 0
+
+    gf["down"] = False
+    response = client.get("/api", params={"t": "search", "q": "rare title", "apikey": "t"})
+
+    assert response.status_code == 200
+    assert "Rare.Title.900000" in response.text